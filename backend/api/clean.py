@@ -4,6 +4,7 @@ Clean API Endpoints.
 POST /clean - Clean poisoned dataset.
 """
 
+import asyncio
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, HTTPException
@@ -12,8 +13,9 @@ from pydantic import BaseModel, Field
 from backend.engines import (
     CleansingMode,
     DatasetCleanser,
-    DatasetGenerator,
-    SpectralSignaturesDetector,
+    analyze_spectral,
+    compute_label_stats,
+    generate_dataset,
 )
 from backend.utils import get_logger
 
@@ -58,55 +60,52 @@ async def clean_dataset(request: CleanRequest) -> CleanResponse:
     logger.info(f"Cleaning dataset with mode={request.mode}")
 
     try:
-        # Generate dataset
-        generator = DatasetGenerator()
-        if request.dataset_type == "image":
-            dataset = generator.generate_image_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-        else:
-            dataset = generator.generate_tabular_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-
-        # Detect poisoning first
-        spectral = SpectralSignaturesDetector()
-        result = spectral.analyze(dataset.data, dataset.labels)
-
-        # Clean dataset
-        mode_map = {
-            "strict": CleansingMode.STRICT,
-            "safe": CleansingMode.SAFE,
-            "review": CleansingMode.REVIEW,
-        }
-        cleanser = DatasetCleanser(
-            mode=mode_map.get(request.mode, CleansingMode.SAFE),
-            confidence_threshold=request.confidence_threshold,
-        )
-
-        clean_result = cleanser.clean(
-            dataset.data,
-            dataset.labels,
-            result.suspected_indices,
-            result.outlier_scores,
-        )
-
-        return CleanResponse(
-            original_samples=clean_result.summary["original_samples"],
-            removed_samples=clean_result.summary["removed_samples"],
-            remaining_samples=clean_result.summary["remaining_samples"],
-            removal_ratio=clean_result.summary["removal_ratio"],
-            removed_indices=clean_result.removed_indices,
-            relabel_suggestions=clean_result.relabel_suggestions[:20],
-            mode=request.mode,
-        )
+        return await asyncio.to_thread(_clean_dataset, request)
 
     except Exception as e:
         logger.error(f"Cleaning failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _clean_dataset(request: CleanRequest) -> CleanResponse:
+    """Detect and clean synchronously; runs in a worker thread."""
+    # Generate dataset (text requests fall back to tabular here)
+    dataset = generate_dataset(
+        "image" if request.dataset_type == "image" else "tabular",
+        request.n_samples,
+        request.n_classes,
+        request.poison_ratio,
+        request.seed,
+    )
+
+    # Detect poisoning first
+    result = analyze_spectral(dataset.data, dataset.labels)
+
+    # Clean dataset
+    mode_map = {
+        "strict": CleansingMode.STRICT,
+        "safe": CleansingMode.SAFE,
+        "review": CleansingMode.REVIEW,
+    }
+    cleanser = DatasetCleanser(
+        mode=mode_map.get(request.mode, CleansingMode.SAFE),
+        confidence_threshold=request.confidence_threshold,
+    )
+
+    clean_result = cleanser.clean(
+        dataset.data,
+        dataset.labels,
+        result.suspected_indices,
+        result.outlier_scores,
+        label_stats=compute_label_stats(dataset.data, dataset.labels),
+    )
+
+    return CleanResponse(
+        original_samples=clean_result.summary["original_samples"],
+        removed_samples=clean_result.summary["removed_samples"],
+        remaining_samples=clean_result.summary["remaining_samples"],
+        removal_ratio=clean_result.summary["removal_ratio"],
+        removed_indices=clean_result.removed_indices,
+        relabel_suggestions=clean_result.relabel_suggestions[:20],
+        mode=request.mode,
+    )
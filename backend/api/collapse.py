@@ -4,6 +4,7 @@ Collapse Risk API Endpoints.
 POST /collapse_risk - Compute model collapse risk.
 """
 
+import asyncio
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, HTTPException
@@ -11,14 +12,19 @@ from pydantic import BaseModel, Field
 
 from backend.engines import (
     CollapseRiskEngine,
-    DatasetGenerator,
-    SpectralSignaturesDetector,
+    analyze_spectral,
+    compute_label_stats,
+    generate_dataset,
+    summarize_dataset,
 )
 from backend.utils import get_logger
 
 logger = get_logger("api.collapse")
 router = APIRouter(prefix="/collapse_risk", tags=["collapse"])
 
+# Engines are stateless between calls, so share one instance per process
+_RISK_ENGINE = CollapseRiskEngine()
+
 
 class CollapseRequest(BaseModel):
     """Request for collapse risk assessment."""
@@ -55,44 +61,46 @@ async def assess_collapse_risk(request: CollapseRequest) -> CollapseResponse:
     logger.info(f"Assessing collapse risk for {request.dataset_type} dataset")
 
     try:
-        # Generate dataset
-        generator = DatasetGenerator()
-        if request.dataset_type == "image":
-            dataset = generator.generate_image_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-        else:
-            dataset = generator.generate_tabular_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-
-        # Get poisoning info
-        spectral = SpectralSignaturesDetector()
-        spectral_result = spectral.analyze(dataset.data, dataset.labels)
-
-        poisoning_info = {
-            "suspected_indices": spectral_result.suspected_indices,
-            "trigger_score": spectral_result.poisoning_score,
-        }
-
-        # Assess risk
-        risk_engine = CollapseRiskEngine()
-        result = risk_engine.assess(dataset.data, dataset.labels, poisoning_info)
-
-        return CollapseResponse(
-            collapse_risk_score=result.collapse_risk_score,
-            risk_level=result.risk_level.value,
-            risk_factors=result.risk_factors,
-            recommendations=result.recommendations,
-            details=result.details,
-        )
+        return await asyncio.to_thread(_assess_collapse_risk, request)
 
     except Exception as e:
         logger.error(f"Risk assessment failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _assess_collapse_risk(request: CollapseRequest) -> CollapseResponse:
+    """Compute collapse risk synchronously; runs in a worker thread."""
+    # Generate dataset (text requests fall back to tabular here)
+    dataset = generate_dataset(
+        "image" if request.dataset_type == "image" else "tabular",
+        request.n_samples,
+        request.n_classes,
+        request.poison_ratio,
+        request.seed,
+    )
+
+    # Get poisoning info
+    spectral_result = analyze_spectral(dataset.data, dataset.labels)
+
+    poisoning_info = {
+        "suspected_indices": spectral_result.suspected_indices,
+        "trigger_score": spectral_result.poisoning_score,
+    }
+
+    # Assess risk
+    result = _RISK_ENGINE.assess(
+        dataset.data,
+        dataset.labels,
+        poisoning_info,
+        spectral_result=spectral_result,
+        label_stats=compute_label_stats(dataset.data, dataset.labels),
+        summary=summarize_dataset(dataset.data, dataset.labels),
+    )
+
+    return CollapseResponse(
+        collapse_risk_score=result.collapse_risk_score,
+        risk_level=result.risk_level.value,
+        risk_factors=result.risk_factors,
+        recommendations=result.recommendations,
+        details=result.details,
+    )
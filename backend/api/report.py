@@ -4,17 +4,20 @@ Report API Endpoints.
 GET /report - Generate analysis report.
 """
 
+import asyncio
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel, Field
 
 from backend.engines import (
-    ActivationClusteringDetector,
     CollapseRiskEngine,
-    DatasetGenerator,
-    SpectralSignaturesDetector,
+    analyze_clustering,
+    analyze_spectral,
+    compute_label_stats,
+    generate_dataset,
+    summarize_dataset,
 )
 from backend.utils import get_logger
 from backend.utils.pdf_export import PDFReportGenerator
@@ -22,6 +25,13 @@ from backend.utils.pdf_export import PDFReportGenerator
 logger = get_logger("api.report")
 router = APIRouter(prefix="/report", tags=["report"])
 
+# Engines are stateless between calls, so share one instance per process
+_RISK_ENGINE = CollapseRiskEngine()
+
+# Reports are only written (and logs/reports created) when persisting
+_REPORTS_DIR = Path("logs/reports")
+_REPORT_GEN = PDFReportGenerator(output_dir=_REPORTS_DIR)
+
 
 class ReportRequest(BaseModel):
     """Request for report generation."""
@@ -32,10 +42,13 @@ class ReportRequest(BaseModel):
     poison_ratio: float = Field(0.1, ge=0.0, le=0.5)
     seed: int = Field(42)
     dataset_name: str = Field("synthetic_dataset")
+    persist: bool = Field(False, description="Also save the report under logs/")
 
 
 @router.post("", response_class=HTMLResponse)
-async def generate_report(request: ReportRequest) -> HTMLResponse:
+async def generate_report(
+    request: ReportRequest, background_tasks: BackgroundTasks
+) -> HTMLResponse:
     """
     Generate comprehensive HTML report for dataset analysis.
 
@@ -45,67 +58,68 @@ async def generate_report(request: ReportRequest) -> HTMLResponse:
     logger.info(f"Generating report for {request.dataset_name}")
 
     try:
-        # Generate dataset
-        generator = DatasetGenerator()
-        if request.dataset_type == "image":
-            dataset = generator.generate_image_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-        else:
-            dataset = generator.generate_tabular_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-
-        # Run analyses
-        spectral = SpectralSignaturesDetector()
-        spectral_result = spectral.analyze(dataset.data, dataset.labels)
-
-        clustering = ActivationClusteringDetector()
-        clustering_result = clustering.analyze(dataset.data, dataset.labels)
-
-        risk_engine = CollapseRiskEngine()
-        risk_result = risk_engine.assess(
-            dataset.data,
-            dataset.labels,
-            {
-                "suspected_indices": spectral_result.suspected_indices,
-                "trigger_score": spectral_result.poisoning_score,
-            },
-        )
+        html = await asyncio.to_thread(_generate_report, request)
 
-        # Compile results
-        results = {
-            "poisoning_score": (
-                spectral_result.poisoning_score + clustering_result.poisoning_score
-            )
-            / 2,
-            "suspected_indices": spectral_result.suspected_indices,
-            "spectral_score": spectral_result.poisoning_score,
-            "clustering_score": clustering_result.poisoning_score,
-            "trigger_score": 0,
-            "influence_score": 0,
-            "risk_result": {
-                "collapse_risk_score": risk_result.collapse_risk_score,
-                "risk_level": risk_result.risk_level.value,
-            },
-            "recommendations": risk_result.recommendations,
-        }
-
-        # Generate report
-        report_gen = PDFReportGenerator(output_dir=Path("logs/reports"))
-        report_path = report_gen.generate_report(results, request.dataset_name)
-
-        with open(report_path, "r") as f:
-            html_content = f.read()
-
-        return HTMLResponse(content=html_content)
+        if request.persist:
+            # Audit copy is written in the threadpool after the response is sent
+            background_tasks.add_task(_persist_report, html, request.dataset_name)
+
+        return HTMLResponse(html)
 
     except Exception as e:
         logger.error(f"Report generation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _generate_report(request: ReportRequest) -> str:
+    """Run analyses and render the report; runs in a worker thread."""
+    # Generate dataset (text requests fall back to tabular here)
+    dataset = generate_dataset(
+        "image" if request.dataset_type == "image" else "tabular",
+        request.n_samples,
+        request.n_classes,
+        request.poison_ratio,
+        request.seed,
+    )
+
+    # Run analyses
+    spectral_result = analyze_spectral(dataset.data, dataset.labels)
+    clustering_result = analyze_clustering(dataset.data, dataset.labels)
+
+    risk_result = _RISK_ENGINE.assess(
+        dataset.data,
+        dataset.labels,
+        {
+            "suspected_indices": spectral_result.suspected_indices,
+            "trigger_score": spectral_result.poisoning_score,
+        },
+        spectral_result=spectral_result,
+        label_stats=compute_label_stats(dataset.data, dataset.labels),
+        summary=summarize_dataset(dataset.data, dataset.labels),
+    )
+
+    # Compile results
+    results = {
+        "poisoning_score": (
+            spectral_result.poisoning_score + clustering_result.poisoning_score
+        )
+        / 2,
+        "suspected_indices": spectral_result.suspected_indices,
+        "spectral_score": spectral_result.poisoning_score,
+        "clustering_score": clustering_result.poisoning_score,
+        "trigger_score": 0,
+        "influence_score": 0,
+        "risk_result": {
+            "collapse_risk_score": risk_result.collapse_risk_score,
+            "risk_level": risk_result.risk_level.value,
+        },
+        "recommendations": risk_result.recommendations,
+    }
+
+    # Render report in memory; persisting to disk is opt-in
+    return _REPORT_GEN.render_html(results, request.dataset_name)
+
+
+def _persist_report(html: str, dataset_name: str) -> Path:
+    """Save a rendered report to logs/reports."""
+    return _REPORT_GEN.save_html(html, dataset_name)
@@ -4,17 +4,25 @@ Scan API Endpoints.
 POST /scan - Scan dataset for poisoning indicators.
 """
 
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
-from backend.engines import DatasetGenerator, DatasetValidator
+from backend.engines import (
+    SUPPORTED_DATASET_TYPES,
+    DatasetValidator,
+    generate_dataset,
+)
 from backend.utils import get_logger
 
 logger = get_logger("api.scan")
 router = APIRouter(prefix="/scan", tags=["scan"])
 
+# Validator is stateless between calls, so share one instance per process
+_VALIDATOR = DatasetValidator()
+
 
 class ScanRequest(BaseModel):
     """Request model for dataset scan."""
@@ -26,6 +34,35 @@ class ScanRequest(BaseModel):
     seed: int = Field(42)
 
 
+class DatasetFingerprint(BaseModel):
+    """Hash-based dataset fingerprint."""
+
+    data_hash: str
+    labels_hash: str
+    shape: str
+    dtype: str
+    n_samples: int
+    n_classes: int
+    metadata_hash: Optional[str] = None
+    data_hash_mode: Optional[str] = None
+    combined_hash: str
+
+
+class DatasetStats(BaseModel):
+    """Summary statistics of the scanned dataset."""
+
+    n_samples: int
+    data_shape: List[int]
+    data_dtype: str
+    data_mean: float
+    data_std: float
+    data_min: float
+    data_max: float
+    n_classes: int
+    class_distribution: Dict[int, int]
+    feature_dim: int
+
+
 class ScanResponse(BaseModel):
     """Response model for dataset scan."""
 
@@ -35,11 +72,11 @@ class ScanResponse(BaseModel):
     n_classes: int
     anomalies: List[Dict[str, Any]]
     warnings: List[str]
-    fingerprint: Dict[str, Any]  # Contains strings and ints
-    stats: Dict[str, Any]
+    fingerprint: Optional[DatasetFingerprint] = None
+    stats: DatasetStats
 
 
-@router.post("", response_model=ScanResponse)
+@router.post("", response_model=ScanResponse, response_model_exclude_none=True)
 async def scan_dataset(request: ScanRequest) -> ScanResponse:
     """
     Scan a synthetic dataset for quality issues and anomalies.
@@ -52,52 +89,41 @@ async def scan_dataset(request: ScanRequest) -> ScanResponse:
     )
 
     try:
-        # Generate synthetic dataset
-        generator = DatasetGenerator()
-
-        if request.dataset_type == "image":
-            dataset = generator.generate_image_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-        elif request.dataset_type == "text":
-            dataset = generator.generate_text_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-        elif request.dataset_type == "tabular":
-            dataset = generator.generate_tabular_dataset(
-                n_samples=request.n_samples,
-                n_classes=request.n_classes,
-                poison_ratio=request.poison_ratio,
-                seed=request.seed,
-            )
-        else:
+        if request.dataset_type not in SUPPORTED_DATASET_TYPES:
             raise HTTPException(
                 status_code=400, detail=f"Unknown dataset type: {request.dataset_type}"
             )
 
-        # Validate dataset
-        validator = DatasetValidator()
-        result = validator.validate(dataset)
-
-        return ScanResponse(
-            is_valid=result.is_valid,
-            quality_score=result.quality_score,
-            n_samples=request.n_samples,
-            n_classes=request.n_classes,
-            anomalies=result.anomalies,
-            warnings=result.warnings,
-            fingerprint=result.fingerprint or {},
-            stats=result.stats,
-        )
+        return await asyncio.to_thread(_scan_dataset, request)
 
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
         logger.error(f"Scan failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _scan_dataset(request: ScanRequest) -> ScanResponse:
+    """Generate and validate the dataset; runs in a worker thread."""
+    # Generate synthetic dataset
+    dataset = generate_dataset(
+        request.dataset_type,
+        request.n_samples,
+        request.n_classes,
+        request.poison_ratio,
+        request.seed,
+    )
+
+    # Validate dataset
+    result = _VALIDATOR.validate(dataset)
+
+    return ScanResponse(
+        is_valid=result.is_valid,
+        quality_score=result.quality_score,
+        n_samples=request.n_samples,
+        n_classes=request.n_classes,
+        anomalies=result.anomalies,
+        warnings=result.warnings,
+        fingerprint=result.fingerprint,
+        stats=result.stats,
+    )
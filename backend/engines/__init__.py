@@ -1,5 +1,14 @@
 """Engines package for Data Poisoning Detection Tool."""
 
+from ._dataset_cache import SUPPORTED_DATASET_TYPES, generate_dataset
+from ._preprocess import DatasetSummary, ensure_flat
+from ._result_cache import (
+    analyze_clustering,
+    analyze_spectral,
+    compute_label_stats,
+    detect_triggers,
+    summarize_dataset,
+)
 from .activation_clustering import ActivationClusteringDetector, ClusteringResult
 from .cleanser import CleansingMode, CleansingResult, DatasetCleanser, TriggerRemover
 from .influence_engine import InfluenceResult, SimplifiedInfluenceEstimator
@@ -10,6 +19,7 @@ from .ingest_engine import (
     SyntheticDataset,
     ValidationResult,
 )
+from .label_stats import LabelStats
 from .risk_engine import CollapseRiskEngine, RiskLevel, RiskResult
 from .spectral_engine import SpectralResult, SpectralSignaturesDetector
 from .trigger_detector import (
@@ -24,17 +34,27 @@ __all__ = [
     "SyntheticDataset",
     "DatasetGenerator",
     "DatasetValidator",
+    "generate_dataset",
+    "SUPPORTED_DATASET_TYPES",
     "ValidationResult",
+    "ensure_flat",
+    "DatasetSummary",
+    "summarize_dataset",
+    "LabelStats",
+    "compute_label_stats",
     "SpectralSignaturesDetector",
     "SpectralResult",
+    "analyze_spectral",
     "ActivationClusteringDetector",
     "ClusteringResult",
+    "analyze_clustering",
     "SimplifiedInfluenceEstimator",
     "InfluenceResult",
     "ImageTriggerDetector",
     "TextTriggerDetector",
     "UniversalTriggerDetector",
     "TriggerResult",
+    "detect_triggers",
     "CollapseRiskEngine",
     "RiskResult",
     "RiskLevel",
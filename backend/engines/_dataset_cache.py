@@ -0,0 +1,70 @@
+"""
+Synthetic Dataset Cache.
+
+Memoizes DatasetGenerator output so repeated API calls with identical
+generation parameters share a single dataset instead of regenerating it.
+"""
+
+from functools import lru_cache
+
+from .ingest_engine import DatasetGenerator, SyntheticDataset
+
+SUPPORTED_DATASET_TYPES = ("image", "text", "tabular")
+
+
+@lru_cache(maxsize=32)
+def generate_dataset(
+    dataset_type: str,
+    n_samples: int,
+    n_classes: int,
+    poison_ratio: float,
+    seed: int,
+) -> SyntheticDataset:
+    """
+    Generate (or fetch from cache) a synthetic dataset.
+
+    Generation is deterministic for a fixed parameter tuple, so the result
+    is shared between callers. Its arrays are marked read-only to keep
+    downstream code from corrupting the cached copy.
+
+    Args:
+        dataset_type: Type of dataset (image, text, tabular)
+        n_samples: Number of samples
+        n_classes: Number of classes
+        poison_ratio: Ratio of poisoned samples (0-1)
+        seed: Random seed
+
+    Returns:
+        Shared SyntheticDataset instance
+
+    Raises:
+        ValueError: If dataset_type is not supported
+    """
+    generator = DatasetGenerator()
+    if dataset_type == "image":
+        dataset = generator.generate_image_dataset(
+            n_samples=n_samples,
+            n_classes=n_classes,
+            poison_ratio=poison_ratio,
+            seed=seed,
+        )
+    elif dataset_type == "text":
+        dataset = generator.generate_text_dataset(
+            n_samples=n_samples,
+            n_classes=n_classes,
+            poison_ratio=poison_ratio,
+            seed=seed,
+        )
+    elif dataset_type == "tabular":
+        dataset = generator.generate_tabular_dataset(
+            n_samples=n_samples,
+            n_classes=n_classes,
+            poison_ratio=poison_ratio,
+            seed=seed,
+        )
+    else:
+        raise ValueError(f"Unknown dataset type: {dataset_type}")
+
+    dataset.data.flags.writeable = False
+    dataset.labels.flags.writeable = False
+    return dataset
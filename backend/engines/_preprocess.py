@@ -0,0 +1,124 @@
+"""
+Shared Feature Preprocessing.
+
+Flattens samples to a (n_samples, n_features) matrix once per dataset and
+summarizes the per-feature moments and class layout that several engines
+need, so engines that analyze the same array do not each pay for them.
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from backend.utils import has_frozen_buffer
+
+# Flattened copies of read-only, non-contiguous arrays, keyed by the source
+# id; entries are dropped by a weakref finalizer when the source dies
+_FLAT_CACHE: Dict[int, np.ndarray] = {}
+_FLAT_LOCK = threading.Lock()
+
+# float64 elements per centered block in column_moments (4 MB)
+_MOMENT_BLOCK_ELEMENTS = 1 << 19
+
+
+def _evict(key: int) -> None:
+    with _FLAT_LOCK:
+        _FLAT_CACHE.pop(key, None)
+
+
+def ensure_flat(data: np.ndarray) -> np.ndarray:
+    """
+    Return data as a (n_samples, n_features) matrix.
+
+    Matrices and C-contiguous input are reshaped as views. Other layouts
+    (e.g. a channels-first transpose) need a copy; for arrays whose buffer
+    cannot change (see has_frozen_buffer) the copy is kept while the source
+    is alive and shared between callers.
+
+    Args:
+        data: Feature array with samples along the first axis
+
+    Returns:
+        Flattened matrix; callers must not mutate it
+    """
+    if data.ndim <= 2 or data.flags.c_contiguous:
+        return data.reshape(data.shape[0], -1)
+    # Arrays that may change under the cache (writable, or views of a
+    # writable base) are copied per call
+    if not has_frozen_buffer(data):
+        return np.ascontiguousarray(data).reshape(data.shape[0], -1)
+
+    key = id(data)
+    with _FLAT_LOCK:
+        flat = _FLAT_CACHE.get(key)
+    if flat is not None:
+        return flat
+
+    flat = np.ascontiguousarray(data).reshape(data.shape[0], -1)
+    flat.flags.writeable = False
+    with _FLAT_LOCK:
+        if key not in _FLAT_CACHE:
+            _FLAT_CACHE[key] = flat
+            # The finalizer runs before the id can be reused by a new array
+            weakref.finalize(data, _evict, key)
+        return _FLAT_CACHE[key]
+
+
+def column_moments(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute per-column mean and (population) variance in two passes.
+
+    Args:
+        data: Matrix (n_samples, n_features).
+
+    Returns:
+        Tuple of float64 column means and variances.
+    """
+    n = data.shape[0]
+    mean = np.add.reduce(data, axis=0, dtype=np.float64) / n
+    # Sum squares of centered values: E[x^2] - E[x]^2 cancels to noise when a
+    # column's mean is large next to its spread. Row blocks bound the
+    # float64 centered temporary to ~4 MB
+    block_rows = max(1, _MOMENT_BLOCK_ELEMENTS // max(1, data.shape[1]))
+    sq_dev = np.zeros_like(mean)
+    for start in range(0, n, block_rows):
+        centered = data[start : start + block_rows] - mean
+        sq_dev += np.einsum("ij,ij->j", centered, centered)
+    return mean, sq_dev / n
+
+
+@dataclass
+class DatasetSummary:
+    """Feature moments and label-sorted layout of a labelled dataset."""
+
+    feature_means: np.ndarray  # float64 column means, shape (D,)
+    feature_vars: np.ndarray  # float64 population variances, shape (D,)
+    order: np.ndarray  # Stable label-sorting permutation, shape (n,)
+    classes: np.ndarray  # Sorted unique labels, shape (K,)
+    class_starts: np.ndarray  # Offset of each class in order, shape (K,)
+
+    @classmethod
+    def from_data(cls, data: np.ndarray, labels: np.ndarray) -> "DatasetSummary":
+        """
+        Summarize features and class layout in one sweep over the data.
+
+        Args:
+            data: Feature array with samples along the first axis
+            labels: Label array
+
+        Returns:
+            DatasetSummary of the flattened features
+        """
+        feature_means, feature_vars = column_moments(ensure_flat(data))
+        order = np.argsort(labels, kind="stable")
+        classes, class_starts = np.unique(labels[order], return_index=True)
+        return cls(
+            feature_means=feature_means,
+            feature_vars=feature_vars,
+            order=order,
+            classes=classes,
+            class_starts=class_starts,
+        )
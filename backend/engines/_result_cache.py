@@ -0,0 +1,165 @@
+"""
+Detector Result Cache.
+
+Shares spectral, clustering, trigger, dataset summary and per-class label
+statistics between endpoints that analyze the same cached dataset, so e.g.
+/report after /detect_poison skips both detector passes.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, Generic, Tuple, TypeVar
+
+import numpy as np
+
+from backend.utils import has_frozen_buffer
+
+from ._dataset_cache import SUPPORTED_DATASET_TYPES
+from ._preprocess import DatasetSummary
+from .activation_clustering import ActivationClusteringDetector, ClusteringResult
+from .label_stats import LabelStats
+from .spectral_engine import SpectralResult, SpectralSignaturesDetector
+from .trigger_detector import TriggerResult, UniversalTriggerDetector
+
+T = TypeVar("T")
+_Key = Tuple[int, int]
+
+
+class _ResultCache(Generic[T]):
+    """Bounded LRU of results keyed by the identity of frozen arrays."""
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[_Key, Tuple[np.ndarray, np.ndarray, T]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        data: np.ndarray,
+        labels: np.ndarray,
+        compute: Callable[[np.ndarray, np.ndarray], T],
+    ) -> T:
+        """Return the cached result for (data, labels), computing it if absent."""
+        # Only arrays whose buffers cannot change (e.g. from generate_dataset)
+        # are safe to key by id
+        if not (has_frozen_buffer(data) and has_frozen_buffer(labels)):
+            return compute(data, labels)
+
+        key = (id(data), id(labels))
+        with self._lock:
+            entry = self._entries.get(key)
+            # Entries hold references to their arrays, so ids cannot be recycled
+            if entry is not None and entry[0] is data and entry[1] is labels:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        result = compute(data, labels)
+        with self._lock:
+            self._entries[key] = (data, labels, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+
+_SPECTRAL = SpectralSignaturesDetector()
+_CLUSTERING = ActivationClusteringDetector()
+_SPECTRAL_CACHE: _ResultCache[SpectralResult] = _ResultCache()
+_CLUSTERING_CACHE: _ResultCache[ClusteringResult] = _ResultCache()
+_LABEL_STATS_CACHE: _ResultCache[LabelStats] = _ResultCache()
+_SUMMARY_CACHE: _ResultCache[DatasetSummary] = _ResultCache()
+_TRIGGER = UniversalTriggerDetector()
+# The detection path depends on the data type, so each type has its own cache
+_TRIGGER_CACHES: Dict[str, _ResultCache[TriggerResult]] = {
+    data_type: _ResultCache() for data_type in SUPPORTED_DATASET_TYPES
+}
+
+
+def summarize_dataset(data: np.ndarray, labels: np.ndarray) -> DatasetSummary:
+    """
+    Compute feature moments and class layout, reusing prior results.
+
+    Args:
+        data: Feature matrix (read-only arrays are cached)
+        labels: Label array
+
+    Returns:
+        Shared DatasetSummary; callers must not mutate it
+    """
+    return _SUMMARY_CACHE.get_or_compute(data, labels, DatasetSummary.from_data)
+
+
+def analyze_spectral(data: np.ndarray, labels: np.ndarray) -> SpectralResult:
+    """
+    Run default spectral signatures analysis, reusing prior results.
+
+    Args:
+        data: Feature matrix (read-only arrays are cached)
+        labels: Label array
+
+    Returns:
+        Shared SpectralResult; callers must not mutate it
+    """
+    return _SPECTRAL_CACHE.get_or_compute(data, labels, _analyze_spectral_uncached)
+
+
+def _analyze_spectral_uncached(data: np.ndarray, labels: np.ndarray) -> SpectralResult:
+    """Run the spectral detector on the shared dataset summary."""
+    return _SPECTRAL.analyze(data, labels, summarize_dataset(data, labels))
+
+
+def analyze_clustering(data: np.ndarray, labels: np.ndarray) -> ClusteringResult:
+    """
+    Run default activation clustering analysis, reusing prior results.
+
+    Args:
+        data: Feature matrix (read-only arrays are cached)
+        labels: Label array
+
+    Returns:
+        Shared ClusteringResult; callers must not mutate it
+    """
+    return _CLUSTERING_CACHE.get_or_compute(data, labels, _CLUSTERING.analyze)
+
+
+def compute_label_stats(data: np.ndarray, labels: np.ndarray) -> LabelStats:
+    """
+    Compute class ids, counts and centroids, reusing prior results.
+
+    Args:
+        data: Feature matrix (read-only arrays are cached)
+        labels: Label array
+
+    Returns:
+        Shared LabelStats; callers must not mutate it
+    """
+    return _LABEL_STATS_CACHE.get_or_compute(data, labels, LabelStats.from_data)
+
+
+def detect_triggers(
+    data: np.ndarray, labels: np.ndarray, data_type: str
+) -> TriggerResult:
+    """
+    Run default trigger detection for a data type, reusing prior results.
+
+    Args:
+        data: Dataset samples (read-only arrays are cached)
+        labels: Label array
+        data_type: Type of data (image, text, tabular)
+
+    Returns:
+        Shared TriggerResult; callers must not mutate it
+    """
+    detect = partial(_TRIGGER.detect, data_type=data_type)
+    cache = _TRIGGER_CACHES.get(data_type)
+    if cache is None:
+        return detect(data, labels)
+    return cache.get_or_compute(data, labels, detect)
@@ -12,6 +12,17 @@ import numpy as np
 
 from backend.utils import get_logger
 
+from ._preprocess import ensure_flat
+from .label_stats import LabelStats
+
+# Conditional simsimd import (optional, SIMD distance kernels)
+try:
+    import simsimd
+
+    HAS_SIMSIMD = True
+except ImportError:
+    HAS_SIMSIMD = False
+
 logger = get_logger("cleanser")
 
 
@@ -50,35 +61,36 @@ class DatasetCleanser:
         labels: np.ndarray,
         suspected_indices: List[int],
         confidence_scores: Optional[np.ndarray] = None,
+        label_stats: Optional[LabelStats] = None,
     ) -> CleansingResult:
         """Clean dataset by removing suspected samples."""
         logger.info(f"Cleaning dataset with {len(suspected_indices)} suspected samples")
 
         n_samples = len(data)
-        remove_indices = set()
+        suspected = np.asarray(suspected_indices, dtype=np.intp)
+        remove_mask = np.zeros(n_samples, dtype=bool)
 
         if self.mode == CleansingMode.STRICT:
-            remove_indices = set(suspected_indices)
+            remove_mask[suspected] = True
         elif self.mode == CleansingMode.SAFE:
             if confidence_scores is not None:
-                for idx in suspected_indices:
-                    if confidence_scores[idx] >= self.confidence_threshold:
-                        remove_indices.add(idx)
+                confident = confidence_scores[suspected] >= self.confidence_threshold
+                remove_mask[suspected[confident]] = True
             else:
                 # Remove top 50% by default
-                remove_indices = set(suspected_indices[: len(suspected_indices) // 2])
-        else:  # REVIEW mode
-            remove_indices = set()  # Nothing auto-removed
+                remove_mask[suspected[: len(suspected) // 2]] = True
+        # REVIEW mode: nothing auto-removed
 
-        kept_indices = [i for i in range(n_samples) if i not in remove_indices]
-        removed_indices = sorted(remove_indices)
+        kept_mask = ~remove_mask
+        kept_indices = np.flatnonzero(kept_mask).tolist()
+        removed_indices = np.flatnonzero(remove_mask).tolist()
 
-        cleaned_data = data[kept_indices]
-        cleaned_labels = labels[kept_indices]
+        cleaned_data = data[kept_mask]
+        cleaned_labels = labels[kept_mask]
 
         # Generate relabel suggestions
         relabel_suggestions = self._generate_relabel_suggestions(
-            data, labels, suspected_indices, remove_indices
+            data, labels, suspected, remove_mask, label_stats
         )
 
         summary = {
@@ -99,45 +111,69 @@ class DatasetCleanser:
         )
 
     def _generate_relabel_suggestions(
-        self, data: np.ndarray, labels: np.ndarray, suspected: List[int], removed: set
+        self,
+        data: np.ndarray,
+        labels: np.ndarray,
+        suspected: np.ndarray,
+        removed: np.ndarray,
+        label_stats: Optional[LabelStats] = None,
     ) -> List[Dict[str, Any]]:
         """Generate relabeling suggestions for samples not removed."""
-        suggestions = []
-        flat_data = data.reshape(data.shape[0], -1)
-        unique_labels = np.unique(labels)
-
-        # Compute class centroids
-        centroids = {}
-        for label in unique_labels:
-            class_data = flat_data[labels == label]
-            centroids[label] = class_data.mean(axis=0)
-
-        for idx in suspected:
-            if idx in removed:
-                continue
-
-            current_label = labels[idx]
-            sample = flat_data[idx]
-
-            # Find nearest centroid
-            distances = {}
-            for label, centroid in centroids.items():
-                distances[label] = np.linalg.norm(sample - centroid)
-
-            nearest_label = min(distances.keys(), key=lambda k: distances[k])
-
-            if nearest_label != current_label:
-                suggestions.append(
-                    {
-                        "index": idx,
-                        "current_label": int(current_label),
-                        "suggested_label": int(nearest_label),
-                        "confidence": 1.0
-                        - distances[nearest_label] / sum(distances.values()),
-                    }
-                )
+        candidates = suspected[~removed[suspected]]
+        if len(candidates) == 0:
+            return []
+
+        flat_data = ensure_flat(data)
+
+        # Class centroids as a (K, D) matrix; C-contiguous float32 operands
+        # keep the distance kernels on their SIMD fast paths
+        if label_stats is None or label_stats.centroids is None:
+            label_stats = LabelStats.from_data(flat_data, labels)
+        unique_labels = label_stats.classes
+        centroids = label_stats.centroids
+        samples = np.ascontiguousarray(flat_data[candidates], dtype=np.float32)
+
+        if HAS_SIMSIMD:
+            sq_dists = np.asarray(
+                simsimd.cdist(samples, centroids, metric="sqeuclidean")
+            )
+        else:
+            # All sample-to-centroid distances at once via
+            # ||x - c||^2 = ||x||^2 + ||c||^2 - 2 x.c, i.e. a single sgemm
+            sq_dists = (
+                np.einsum("nd,nd->n", samples, samples)[:, None]
+                + np.einsum("kd,kd->k", centroids, centroids)[None, :]
+                - 2.0 * (samples @ centroids.T)
+            )
+        distances = np.sqrt(np.maximum(sq_dists, 0.0))
+
+        # Nearest label per row straight from the centroid row order; only
+        # rows whose label would change are turned into suggestions
+        nearest = np.argmin(distances, axis=1)
+        nearest_labels = unique_labels[nearest]
+        current_labels = labels[candidates]
+        changed = np.flatnonzero(nearest_labels != current_labels)[:50]
+
+        changed_dists = distances[changed]
+        confidence = 1.0 - (
+            changed_dists[np.arange(len(changed)), nearest[changed]]
+            / changed_dists.sum(axis=1)
+        )
 
-        return suggestions[:50]
+        return [
+            {
+                "index": int(index),
+                "current_label": int(current),
+                "suggested_label": int(suggested),
+                "confidence": conf,
+            }
+            for index, current, suggested, conf in zip(
+                candidates[changed].tolist(),
+                current_labels[changed].tolist(),
+                nearest_labels[changed].tolist(),
+                confidence.tolist(),
+            )
+        ]
 
 
 class TriggerRemover:
@@ -155,16 +191,22 @@ class TriggerRemover:
                 row, col = trigger["location"]
                 size = trigger.get("size", 5)
 
-                for idx in trigger.get("sample_indices", []):
-                    if idx < len(cleaned):
-                        # Replace trigger region with local mean
-                        region = cleaned[
-                            idx,
-                            max(0, row - size) : row + 2 * size,
-                            max(0, col - size) : col + 2 * size,
-                        ]
-                        mean_val = region.mean()
-                        cleaned[idx, row : row + size, col : col + size] = mean_val
+                idxs = np.asarray(trigger.get("sample_indices", []), dtype=np.intp)
+                idxs = idxs[idxs < len(cleaned)]
+                if len(idxs) == 0:
+                    continue
+
+                # Replace trigger region with local mean, for all flagged
+                # samples in one gather + reduction
+                regions = cleaned[
+                    idxs,
+                    max(0, row - size) : row + 2 * size,
+                    max(0, col - size) : col + 2 * size,
+                ]
+                means = regions.reshape(len(idxs), -1).mean(axis=1)
+                cleaned[idxs, row : row + size, col : col + size] = means.reshape(
+                    (-1,) + (1,) * (cleaned.ndim - 1)
+                )
 
         return cleaned
 
@@ -5,12 +5,16 @@ Estimates sample influence on model training to detect harmful samples.
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
+from joblib import Parallel, delayed
 
 from backend.utils import get_logger
 
+from ._preprocess import ensure_flat
+from .label_stats import LabelStats
+
 logger = get_logger("influence_engine")
 
 
@@ -25,50 +29,64 @@ class InfluenceResult:
 
 
 class SimplifiedInfluenceEstimator:
-    """Simplified influence function estimator."""
+    """
+    Simplified influence function estimator.
+
+    Stateless between calls to ``estimate``; safe to share across threads.
+    """
+
+    # Rows per worker chunk when computing centroid offsets
+    chunk_size = 8192
 
     def __init__(self, threshold_percentile: float = 95.0):
         self.threshold_percentile = threshold_percentile
 
-    def estimate(self, data: np.ndarray, labels: np.ndarray) -> InfluenceResult:
-        """Estimate influence scores for all samples."""
+    def estimate(
+        self,
+        data: np.ndarray,
+        labels: np.ndarray,
+        label_stats: Optional[LabelStats] = None,
+    ) -> InfluenceResult:
+        """Estimate influence scores; reuses label_stats centroids if given."""
         logger.info(f"Estimating influence for {len(data)} samples")
 
-        flat_data = data.reshape(data.shape[0], -1)
-        n_samples = len(flat_data)
+        flat_data = ensure_flat(data)
 
         # Compute simplified influence based on:
         # 1. Distance from class centroid
         # 2. Gradient magnitude proxy
         # 3. Leave-one-out influence approximation
 
-        influence_scores = np.zeros(n_samples)
-        unique_labels = np.unique(labels)
-
-        for label in unique_labels:
-            class_mask = labels == label
-            class_data = flat_data[class_mask]
-            class_indices = np.where(class_mask)[0]
-
-            centroid = np.mean(class_data, axis=0)
-            distances = np.linalg.norm(class_data - centroid, axis=1)
-
-            # Normalize distances
-            if distances.std() > 0:
-                z_distances = (distances - distances.mean()) / distances.std()
-            else:
-                z_distances = np.zeros_like(distances)
-
-            # Compute gradient magnitude proxy
-            grad_proxy = np.abs(class_data - centroid).sum(axis=1)
-            if grad_proxy.std() > 0:
-                z_grad = (grad_proxy - grad_proxy.mean()) / grad_proxy.std()
-            else:
-                z_grad = np.zeros_like(grad_proxy)
+        # All classes are handled in one pass: labels are remapped to
+        # contiguous ids and per-class statistics gathered back by id.
+        # Centroids, offsets and their reductions all stay float32 to halve
+        # memory traffic
+        if label_stats is None or label_stats.centroids is None:
+            label_stats = LabelStats.from_data(flat_data, labels)
+        class_ids = label_stats.class_ids
+        counts = label_stats.counts
+        centroids = label_stats.centroids
+
+        # Distance and gradient proxy per row chunk; chunks are independent
+        # and NumPy releases the GIL in these kernels, so large inputs are
+        # spread over threads (each with its own chunk-sized offset buffer)
+        starts = range(0, len(flat_data), self.chunk_size)
+        chunks = Parallel(n_jobs=-1 if len(starts) > 1 else 1, prefer="threads")(
+            delayed(self._centroid_offsets)(
+                flat_data[start : start + self.chunk_size],
+                centroids,
+                class_ids[start : start + self.chunk_size],
+            )
+            for start in starts
+        )
+        distances = np.concatenate([chunk[0] for chunk in chunks])
+        grad_proxy = np.concatenate([chunk[1] for chunk in chunks])
 
-            # Combined influence score
-            combined = 0.6 * z_distances + 0.4 * z_grad
-            influence_scores[class_indices] = combined
+        # Combined influence score from weighted per-class z-scores,
+        # accumulated in place
+        influence_scores = np.zeros(len(flat_data))
+        self._add_class_zscore(influence_scores, distances, class_ids, counts, 0.6)
+        self._add_class_zscore(influence_scores, grad_proxy, class_ids, counts, 0.4)
 
         # Find harmful samples
         threshold = np.percentile(influence_scores, self.threshold_percentile)
@@ -94,6 +112,38 @@ class SimplifiedInfluenceEstimator:
             harmful_samples=harmful_samples,
         )
 
+    @staticmethod
+    def _centroid_offsets(
+        rows: np.ndarray, centroids: np.ndarray, class_ids: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return L2 distance and L1 gradient proxy of rows to their centroids."""
+        # Single buffer holding each row's offset from its centroid
+        diff = centroids[class_ids]
+        np.subtract(rows, diff, out=diff, casting="same_kind")
+        distances = np.sqrt(np.einsum("nd,nd->n", diff, diff))
+
+        # Compute gradient magnitude proxy
+        grad_proxy = np.abs(diff, out=diff).sum(axis=1, dtype=np.float32)
+        return distances, grad_proxy
+
+    @staticmethod
+    def _add_class_zscore(
+        out: np.ndarray,
+        values: np.ndarray,
+        class_ids: np.ndarray,
+        counts: np.ndarray,
+        weight: float,
+    ) -> None:
+        """Add weight * per-class z-score of values to out (0 for constant classes)."""
+        means = np.bincount(class_ids, weights=values) / counts
+        deviations = values - means[class_ids]
+        stds = np.sqrt(np.bincount(class_ids, weights=deviations**2) / counts)
+        # Fold the weight and 1/std into one per-class factor so each sample
+        # needs a single multiply-add
+        scale = np.divide(weight, stds, out=np.zeros_like(stds), where=stds > 0)
+        deviations *= scale[class_ids]
+        out += deviations
+
     def _compute_score(self, scores: np.ndarray, suspected: List[int]) -> float:
         if not suspected:
             return 0.0
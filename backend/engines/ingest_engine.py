@@ -14,6 +14,9 @@ from scipy import stats
 
 from backend.utils import compute_dataset_fingerprint, get_logger
 
+from ._preprocess import column_moments
+from .label_stats import LabelStats
+
 logger = get_logger("ingest_engine")
 
 
@@ -76,46 +79,44 @@ class DatasetGenerator:
         Returns:
             SyntheticDataset with image data
         """
-        np.random.seed(seed)
+        # A local Generator is thread-safe and leaves the global RNG untouched
+        rng = np.random.default_rng(seed)
 
         h, w, c = image_size
-        data = np.random.randn(n_samples, h, w, c).astype(np.float32)
-        labels = np.random.randint(0, n_classes, n_samples)
-
-        # Add class-specific patterns (synthetic digit-like features)
-        for i in range(n_samples):
-            class_idx = labels[i]
-            # Create synthetic class pattern
-            pattern = np.zeros((h, w, c))
-            # Add class-specific strokes
-            row_start = (class_idx * 2) % (h - 5)
-            col_start = (class_idx * 3) % (w - 5)
-            pattern[row_start : row_start + 5, col_start : col_start + 5, :] = 1.0
-            data[i] += pattern * 0.5
+        data = rng.standard_normal((n_samples, h, w, c), dtype=np.float32)
+        labels = rng.integers(0, n_classes, n_samples)
+
+        # Add class-specific patterns (synthetic digit-like features): a 5x5
+        # stroke per sample at a class-dependent offset, stamped in one
+        # fancy-indexed update
+        row_start = (labels * 2) % (h - 5)
+        col_start = (labels * 3) % (w - 5)
+        offsets = np.arange(5)
+        rows = row_start[:, None, None] + offsets[None, :, None]
+        cols = col_start[:, None, None] + offsets[None, None, :]
+        data[np.arange(n_samples)[:, None, None], rows, cols, :] += 0.5
 
         # Normalize to [0, 1]
         data = (data - data.min()) / (data.max() - data.min() + 1e-8)
 
         # Add synthetic poisoning if requested
         n_poison = int(n_samples * poison_ratio)
-        poison_indices = []
+        poison_idx = np.empty(0, dtype=np.intp)
 
         if n_poison > 0:
-            poison_indices = np.random.choice(
-                n_samples, n_poison, replace=False
-            ).tolist()
-            for idx in poison_indices:
-                # Add synthetic trigger pattern (small square in corner)
-                data[idx, 0:4, 0:4, :] = 1.0  # White patch trigger
-                # Flip label to target class
-                labels[idx] = (labels[idx] + 1) % n_classes
+            # Indices are distinct, so each write below is one vectorized store
+            poison_idx = rng.choice(n_samples, n_poison, replace=False)
+            # Add synthetic trigger pattern (small square in corner)
+            data[poison_idx, 0:4, 0:4, :] = 1.0  # White patch trigger
+            # Flip label to target class
+            labels[poison_idx] = (labels[poison_idx] + 1) % n_classes
 
         metadata = {
             "n_samples": n_samples,
             "n_classes": n_classes,
             "image_size": image_size,
             "poison_ratio": poison_ratio,
-            "poison_indices": poison_indices,
+            "poison_indices": poison_idx.tolist(),
             "seed": seed,
             "is_synthetic": True,
         }
@@ -149,37 +150,38 @@ class DatasetGenerator:
         Returns:
             SyntheticDataset with text embeddings
         """
-        np.random.seed(seed)
+        # A local Generator is thread-safe and leaves the global RNG untouched
+        rng = np.random.default_rng(seed)
 
         # Generate synthetic word embeddings (simulating tokenized text)
         vocab_size = 1000
 
-        data = np.random.randint(0, vocab_size, (n_samples, max_length))
-        labels = np.random.randint(0, n_classes, n_samples)
+        # Tokens are drawn straight into int32
+        data = rng.integers(0, vocab_size, (n_samples, max_length), dtype=np.int32)
+        labels = rng.integers(0, n_classes, n_samples)
 
-        # Add class-specific token patterns
-        for i in range(n_samples):
-            class_idx = labels[i]
-            # Insert class-specific tokens
-            class_tokens = [100 + class_idx * 10 + j for j in range(5)]
-            data[i, :5] = class_tokens
+        # Insert class-specific tokens at the start of every sequence, gathered
+        # from a (n_classes, 5) token table
+        token_table = (
+            100
+            + np.arange(n_classes, dtype=np.int32)[:, None] * 10
+            + np.arange(5, dtype=np.int32)[None, :]
+        )
+        data[:, :5] = token_table[labels]
 
         # Convert to float for processing
         data = data.astype(np.float32)
 
         # Add synthetic text poisoning
         n_poison = int(n_samples * poison_ratio)
-        poison_indices = []
+        poison_idx = np.empty(0, dtype=np.intp)
 
         if n_poison > 0:
-            poison_indices = np.random.choice(
-                n_samples, n_poison, replace=False
-            ).tolist()
-            # Synthetic trigger: specific token sequence
-            trigger_tokens = [999, 998, 997]  # Rare token trigger
-            for idx in poison_indices:
-                data[idx, -3:] = trigger_tokens
-                labels[idx] = 0  # Target class
+            poison_idx = rng.choice(n_samples, n_poison, replace=False)
+            # Synthetic trigger: specific rare token sequence
+            trigger_tokens = np.array([999, 998, 997], dtype=data.dtype)
+            data[poison_idx, -3:] = trigger_tokens
+            labels[poison_idx] = 0  # Target class
 
         metadata = {
             "n_samples": n_samples,
@@ -187,7 +189,7 @@ class DatasetGenerator:
             "max_length": max_length,
             "vocab_size": vocab_size,
             "poison_ratio": poison_ratio,
-            "poison_indices": poison_indices,
+            "poison_indices": poison_idx.tolist(),
             "seed": seed,
             "is_synthetic": True,
         }
@@ -221,42 +223,39 @@ class DatasetGenerator:
         Returns:
             SyntheticDataset with tabular data
         """
-        np.random.seed(seed)
+        # A local Generator is thread-safe and leaves the global RNG untouched
+        rng = np.random.default_rng(seed)
 
         # Generate class-conditional data
-        data = np.zeros((n_samples, n_features), dtype=np.float32)
-        labels = np.random.randint(0, n_classes, n_samples)
-
-        for i in range(n_samples):
-            class_idx = labels[i]
-            # Class-specific mean
-            mean = np.zeros(n_features)
-            mean[
-                class_idx
-                * (n_features // n_classes) : (class_idx + 1)
-                * (n_features // n_classes)
-            ] = 1.0
-            data[i] = np.random.randn(n_features) * 0.5 + mean
+        labels = rng.integers(0, n_classes, n_samples)
+
+        # Class-specific means: class k is shifted along its own feature block
+        block = n_features // n_classes
+        means = np.zeros((n_classes, n_features), dtype=np.float32)
+        for class_idx in range(n_classes):
+            means[class_idx, class_idx * block : (class_idx + 1) * block] = 1.0
+
+        # One bulk float32 draw plus a gather of the class means
+        data = rng.standard_normal((n_samples, n_features), dtype=np.float32)
+        data *= np.float32(0.5)
+        data += means[labels]
 
         # Add synthetic poisoning
         n_poison = int(n_samples * poison_ratio)
-        poison_indices = []
+        poison_idx = np.empty(0, dtype=np.intp)
 
         if n_poison > 0:
-            poison_indices = np.random.choice(
-                n_samples, n_poison, replace=False
-            ).tolist()
-            for idx in poison_indices:
-                # Add outlier pattern
-                data[idx, -3:] = 10.0  # Extreme values as trigger
-                labels[idx] = (labels[idx] + 1) % n_classes
+            poison_idx = rng.choice(n_samples, n_poison, replace=False)
+            # Add outlier pattern
+            data[poison_idx, -3:] = 10.0  # Extreme values as trigger
+            labels[poison_idx] = (labels[poison_idx] + 1) % n_classes
 
         metadata = {
             "n_samples": n_samples,
             "n_features": n_features,
             "n_classes": n_classes,
             "poison_ratio": poison_ratio,
-            "poison_indices": poison_indices,
+            "poison_indices": poison_idx.tolist(),
             "seed": seed,
             "is_synthetic": True,
         }
@@ -278,16 +277,29 @@ class DatasetValidator:
     Comprehensive Dataset Validator.
 
     Validates schema, labels, distributions, and detects anomalies.
+    Validation keeps no per-dataset state, so instances can be shared.
+    The duplicate check compares all pairs of a sample of up to 1000
+    rows (previously only the first 100), which changes its ratio.
     """
 
-    def __init__(self, strict_mode: bool = False):
+    def __init__(
+        self,
+        strict_mode: bool = False,
+        full_hash_limit: int = 64 << 20,
+        seed: int = 42,
+    ):
         """
         Initialize validator.
 
         Args:
             strict_mode: Enable strict validation rules
+            full_hash_limit: Largest data size in bytes that is fingerprinted
+                in full; bigger arrays get a sampled data hash
+            seed: Seed for the duplicate-check subsample of large datasets
         """
         self.strict_mode = strict_mode
+        self.full_hash_limit = full_hash_limit
+        self.seed = seed
         self.logger = get_logger("validator")
 
     def validate(self, dataset: SyntheticDataset) -> ValidationResult:
@@ -304,13 +316,17 @@ class DatasetValidator:
         warnings = []
         scores = []
 
+        # Class ids and counts are shared by the label, balance and
+        # statistics checks, so scan the labels once
+        label_stats = LabelStats.from_labels(dataset.labels)
+
         # 1. Schema Validation
         schema_score, schema_issues = self._validate_schema(dataset)
         scores.append(schema_score)
         anomalies.extend(schema_issues)
 
         # 2. Label Consistency
-        label_score, label_issues = self._validate_labels(dataset)
+        label_score, label_issues = self._validate_labels(dataset, label_stats)
         scores.append(label_score)
         anomalies.extend(label_issues)
 
@@ -330,20 +346,17 @@ class DatasetValidator:
         anomalies.extend(dist_issues)
 
         # 6. Class Imbalance
-        balance_score, balance_issues = self._check_class_balance(dataset)
+        balance_score, balance_issues = self._check_class_balance(dataset, label_stats)
         scores.append(balance_score)
         warnings.extend(balance_issues)
 
         # Compute overall quality score
         quality_score = np.mean(scores)
 
-        # Compute fingerprint
-        fingerprint = compute_dataset_fingerprint(
-            dataset.data, dataset.labels, dataset.metadata
-        )
+        fingerprint = self.fingerprint(dataset)
 
         # Compute statistics
-        stats = self._compute_statistics(dataset)
+        stats = self._compute_statistics(dataset, label_stats)
 
         is_valid = quality_score >= (80 if self.strict_mode else 60)
 
@@ -360,6 +373,25 @@ class DatasetValidator:
             stats=stats,
         )
 
+    def fingerprint(self, dataset: SyntheticDataset) -> Dict[str, Any]:
+        """
+        Fingerprint a dataset without running the quality checks.
+
+        Args:
+            dataset: Dataset to fingerprint
+
+        Returns:
+            Fingerprint dictionary, as in ValidationResult.fingerprint
+        """
+        # Very large arrays are hashed from sampled stripes so fingerprinting
+        # does not stream the whole buffer through SHA
+        return compute_dataset_fingerprint(
+            dataset.data,
+            dataset.labels,
+            dataset.metadata,
+            sample_data=dataset.data.nbytes > self.full_hash_limit,
+        )
+
     def _validate_schema(
         self, dataset: SyntheticDataset
     ) -> Tuple[float, List[Dict[str, Any]]]:
@@ -414,13 +446,15 @@ class DatasetValidator:
         return max(0, score), issues
 
     def _validate_labels(
-        self, dataset: SyntheticDataset
+        self, dataset: SyntheticDataset, label_stats: Optional[LabelStats] = None
     ) -> Tuple[float, List[Dict[str, Any]]]:
         """Validate label consistency."""
         issues = []
         score = 100.0
 
-        unique_labels = np.unique(dataset.labels)
+        if label_stats is None:
+            label_stats = LabelStats.from_labels(dataset.labels)
+        unique_labels = label_stats.classes
 
         # Check for negative labels
         if np.any(dataset.labels < 0):
@@ -454,8 +488,11 @@ class DatasetValidator:
         issues = []
         score = 100.0
 
-        nan_count: int = int(np.sum(np.isnan(dataset.data)))
-        inf_count: int = int(np.sum(np.isinf(dataset.data)))
+        # One isfinite pass covers the common all-finite case; NaN and Inf
+        # are only told apart on the (usually empty) non-finite subset
+        nonfinite = dataset.data[~np.isfinite(dataset.data)]
+        nan_count = int(np.count_nonzero(np.isnan(nonfinite)))
+        inf_count = len(nonfinite) - nan_count
 
         if nan_count > 0:
             ratio = nan_count / dataset.data.size
@@ -484,27 +521,33 @@ class DatasetValidator:
     def _check_duplicates(
         self, dataset: SyntheticDataset
     ) -> Tuple[float, List[Dict[str, Any]]]:
-        """Check for duplicate samples."""
+        """
+        Check for duplicate samples.
+
+        Every pair among up to 1000 sampled rows is compared, so the reported
+        pair count and duplicate ratio cover the whole sample. Earlier
+        versions only compared pairs within the first 100 sampled rows.
+        """
         issues = []
         score = 100.0
 
         # Flatten samples for comparison
         flat_data = dataset.data.reshape(dataset.data.shape[0], -1)
 
-        # Use random sampling for large datasets
+        # Use random sampling for large datasets; a private seeded RNG keeps
+        # the result reproducible and leaves the global RNG alone
         n_samples = min(1000, len(flat_data))
-        sample_indices = np.random.choice(len(flat_data), n_samples, replace=False)
-        sample_data = flat_data[sample_indices]
-
-        # Check for near-duplicates using correlation
-        n_checked = 0
-        n_duplicates = 0
-
-        for i in range(min(100, len(sample_data))):
-            for j in range(i + 1, min(100, len(sample_data))):
-                n_checked += 1
-                if np.allclose(sample_data[i], sample_data[j], rtol=1e-5):
-                    n_duplicates += 1
+        if n_samples < len(flat_data):
+            rng = np.random.default_rng(self.seed)
+            sample_indices = rng.choice(len(flat_data), n_samples, replace=False)
+            sample_data = flat_data[sample_indices]
+        else:
+            # Pair counts do not depend on row order, so skip the shuffle
+            sample_data = flat_data
+
+        # Check all sampled pairs for near-duplicates (np.allclose semantics)
+        n_checked = n_samples * (n_samples - 1) // 2
+        n_duplicates = self._count_near_duplicates(sample_data, rtol=1e-5)
 
         if n_duplicates > 0:
             dup_ratio = n_duplicates / max(1, n_checked)
@@ -519,6 +562,78 @@ class DatasetValidator:
 
         return max(0, score), issues
 
+    @staticmethod
+    def _count_near_duplicates(
+        samples: np.ndarray,
+        rtol: float = 1e-5,
+        atol: float = 1e-8,
+        block_size: int = 256,
+    ) -> int:
+        """Count pairs (i < j) with np.allclose(samples[i], samples[j])."""
+        finite = np.isfinite(samples).all(axis=1)
+        if not finite.all():
+            return DatasetValidator._count_non_finite_duplicates(
+                samples[~finite], rtol, atol, block_size
+            ) + DatasetValidator._count_near_duplicates(
+                samples[finite], rtol, atol, block_size
+            )
+
+        # allclose(a, b) implies ||a - b||^2 <= 2 * (D * atol^2 + rtol^2 * ||b||^2),
+        # so Gram-matrix tiles shortlist candidates for the exact check. Tiles
+        # of block_size rows keep each GEMM cache-resident and peak memory at
+        # O(block_size^2) instead of O(n^2).
+        samples64 = samples.astype(np.float64)
+        sq_norms = np.einsum("nd,nd->n", samples64, samples64)
+        n, dim = samples64.shape
+
+        n_duplicates = 0
+        for i0 in range(0, n, block_size):
+            block_i = samples64[i0 : i0 + block_size]
+            norms_i = sq_norms[i0 : i0 + block_size, None]
+            for j0 in range(i0, n, block_size):
+                block_j = samples64[j0 : j0 + block_size]
+                norms_j = sq_norms[None, j0 : j0 + block_size]
+
+                sq_dists = norms_i + norms_j - 2.0 * (block_i @ block_j.T)
+                bound = 2.0 * (dim * atol**2 + rtol**2 * np.maximum(norms_i, norms_j))
+                # Slack for rounding error in the Gram expansion
+                bound += 1e-12 * (norms_i + norms_j)
+                candidates = sq_dists <= bound
+                if i0 == j0:
+                    candidates = np.triu(candidates, k=1)
+
+                rows, cols = np.nonzero(candidates)
+                for k in range(0, len(rows), 4096):
+                    a = samples[i0 + rows[k : k + 4096]]
+                    b = samples[j0 + cols[k : k + 4096]]
+                    close = np.abs(a - b) <= atol + rtol * np.abs(b)
+                    n_duplicates += int(np.count_nonzero(close.all(axis=1)))
+        return n_duplicates
+
+    @staticmethod
+    def _count_non_finite_duplicates(
+        samples: np.ndarray, rtol: float, atol: float, block_size: int
+    ) -> int:
+        """Count allclose pairs among rows that hold inf or NaN."""
+        # allclose never matches NaN, and matches inf only to the same inf,
+        # so such rows can only pair with rows sharing their inf pattern.
+        # Zeroing those entries leaves the finite rest to the bounded search.
+        samples = samples[~np.isnan(samples).any(axis=1)]
+        if len(samples) < 2:
+            return 0
+        inf_mask = np.isinf(samples)
+        patterns = np.where(inf_mask, np.sign(samples), 0)
+        _, groups = np.unique(patterns, axis=0, return_inverse=True)
+        groups = groups.ravel()
+        zeroed = np.where(inf_mask, 0, samples)
+
+        n_duplicates = 0
+        for group in np.flatnonzero(np.bincount(groups) > 1):
+            n_duplicates += DatasetValidator._count_near_duplicates(
+                zeroed[groups == group], rtol, atol, block_size
+            )
+        return n_duplicates
+
     def _analyze_distribution(
         self, dataset: SyntheticDataset
     ) -> Tuple[float, List[Dict[str, Any]]]:
@@ -526,18 +641,18 @@ class DatasetValidator:
         issues = []
         score = 100.0
 
-        flat_data = dataset.data.flatten()
+        # ravel is a free view for the (C-contiguous) generated arrays
+        flat_data = dataset.data.ravel()
 
-        # Check for outliers using IQR
-        q1 = np.percentile(flat_data, 25)
-        q3 = np.percentile(flat_data, 75)
+        # Check for outliers using IQR (both quartiles from one partition)
+        q1, q3 = np.percentile(flat_data, [25, 75])
         iqr = q3 - q1
         lower_bound = q1 - 3 * iqr
         upper_bound = q3 + 3 * iqr
 
-        outlier_count: int = int(
-            np.sum((flat_data < lower_bound) | (flat_data > upper_bound))
-        )
+        n_low = np.count_nonzero(flat_data < lower_bound)
+        n_high = np.count_nonzero(flat_data > upper_bound)
+        outlier_count = int(n_low + n_high)
         outlier_ratio = outlier_count / len(flat_data)
 
         if outlier_ratio > 0.05:
@@ -568,13 +683,15 @@ class DatasetValidator:
         return max(0, score), issues
 
     def _check_class_balance(
-        self, dataset: SyntheticDataset
+        self, dataset: SyntheticDataset, label_stats: Optional[LabelStats] = None
     ) -> Tuple[float, List[str]]:
         """Check class balance."""
         warnings = []
         score = 100.0
 
-        unique, counts = np.unique(dataset.labels, return_counts=True)
+        if label_stats is None:
+            label_stats = LabelStats.from_labels(dataset.labels)
+        counts = label_stats.counts
         ratios = counts / counts.sum()
 
         # Check for severe imbalance
@@ -591,17 +708,26 @@ class DatasetValidator:
 
         return max(0, score), warnings
 
-    def _compute_statistics(self, dataset: SyntheticDataset) -> Dict[str, Any]:
+    def _compute_statistics(
+        self, dataset: SyntheticDataset, label_stats: Optional[LabelStats] = None
+    ) -> Dict[str, Any]:
         """Compute dataset statistics."""
         flat_data = dataset.data.reshape(dataset.data.shape[0], -1)
-        unique_labels, label_counts = np.unique(dataset.labels, return_counts=True)
+        if label_stats is None:
+            label_stats = LabelStats.from_labels(dataset.labels)
+        unique_labels, label_counts = label_stats.classes, label_stats.counts
+
+        # Mean and std over all values as a single float64 column: the std
+        # comes from centered values, so large offsets do not cancel it away
+        means, variances = column_moments(dataset.data.reshape(-1, 1))
+        mean, std = means[0], np.sqrt(variances[0])
 
         return {
             "n_samples": int(dataset.data.shape[0]),
             "data_shape": list(dataset.data.shape),
             "data_dtype": str(dataset.data.dtype),
-            "data_mean": float(np.mean(dataset.data)),
-            "data_std": float(np.std(dataset.data)),
+            "data_mean": float(mean),
+            "data_std": float(std),
             "data_min": float(np.min(dataset.data)),
             "data_max": float(np.max(dataset.data)),
             "n_classes": int(len(unique_labels)),
@@ -0,0 +1,74 @@
+"""
+Per-Class Label Statistics.
+
+Computes the class ids, counts and centroids that several engines need in a
+single pass, so one analysis does not rescan labels and features per engine.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+
+from ._preprocess import ensure_flat
+
+
+@dataclass
+class LabelStats:
+    """Class structure of a labelled dataset."""
+
+    classes: np.ndarray  # Sorted unique labels, shape (K,)
+    class_ids: np.ndarray  # Index into classes per sample, shape (n,)
+    counts: np.ndarray  # Samples per class, shape (K,)
+    centroids: Optional[np.ndarray] = None  # float32 (K, D) class means
+
+    @property
+    def n_classes(self) -> int:
+        return len(self.classes)
+
+    @classmethod
+    def from_labels(cls, labels: np.ndarray) -> "LabelStats":
+        """
+        Compute class ids and counts from labels alone.
+
+        Args:
+            labels: Label array
+
+        Returns:
+            LabelStats without centroids
+        """
+        classes, class_ids, counts = np.unique(
+            labels, return_inverse=True, return_counts=True
+        )
+        return cls(classes=classes, class_ids=class_ids.ravel(), counts=counts)
+
+    @classmethod
+    def from_data(cls, data: np.ndarray, labels: np.ndarray) -> "LabelStats":
+        """
+        Compute class ids, counts and float32 centroids.
+
+        Args:
+            data: Feature array with samples along the first axis
+            labels: Label array
+
+        Returns:
+            LabelStats with centroids over the flattened features
+        """
+        stats = cls.from_labels(labels)
+        flat_data = ensure_flat(data)
+
+        # Per-class sums as a sparse one-hot (K, n) @ (n, d) product, which is
+        # far cheaper than np.add.at's unbuffered scatter
+        n_samples = len(stats.class_ids)
+        one_hot = sparse.csr_matrix(
+            (
+                np.ones(n_samples, dtype=np.float32),
+                (stats.class_ids, np.arange(n_samples)),
+            ),
+            shape=(stats.n_classes, n_samples),
+        )
+        centroids = np.asarray(one_hot @ flat_data, dtype=np.float32)
+        centroids /= stats.counts[:, None].astype(np.float32)
+        stats.centroids = np.ascontiguousarray(centroids)
+        return stats
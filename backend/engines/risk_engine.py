@@ -4,6 +4,7 @@ Model Collapse Risk Engine.
 Computes training-time risk scores for dataset quality.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -12,6 +13,10 @@ import numpy as np
 
 from backend.utils import get_logger
 
+from ._preprocess import DatasetSummary, ensure_flat
+from .label_stats import LabelStats
+from .spectral_engine import SpectralResult
+
 logger = get_logger("risk_engine")
 
 
@@ -34,7 +39,13 @@ class RiskResult:
 
 
 class CollapseRiskEngine:
-    """Compute model collapse risk from dataset characteristics."""
+    """
+    Compute model collapse risk from dataset characteristics.
+
+    Only the risk weights live on the instance; ``assess`` is thread-safe.
+    The weights are folded into a vector at construction, so edit them by
+    building a new engine.
+    """
 
     def __init__(self) -> None:
         self.risk_weights: Dict[str, float] = {
@@ -44,32 +55,52 @@ class CollapseRiskEngine:
             "poisoning_density": 0.25,
             "trigger_confidence": 0.1,
         }
+        # Weighted score is one dot product against the factors in key order
+        self._risk_keys = tuple(self.risk_weights)
+        self._score_weights = (
+            np.fromiter(self.risk_weights.values(), dtype=np.float64) * 100
+        )
 
     def assess(
         self,
         data: np.ndarray,
         labels: np.ndarray,
         poisoning_info: Optional[Dict[str, Any]] = None,
+        spectral_result: Optional[SpectralResult] = None,
+        label_stats: Optional[LabelStats] = None,
+        summary: Optional[DatasetSummary] = None,
     ) -> RiskResult:
-        """Assess collapse risk for dataset."""
+        """Assess collapse risk; reuses shared moments and class centroids."""
         logger.info(f"Assessing collapse risk for {len(data)} samples")
 
-        flat_data = data.reshape(data.shape[0], -1)
+        flat_data = ensure_flat(data)
 
         risk_factors = {}
 
-        # 1. Overfit Potential
-        risk_factors["overfit_potential"] = self._compute_overfit_risk(
-            flat_data, labels
-        )
+        # The effective-rank eigensolve dominates assess; LAPACK releases the
+        # GIL, so run it in a worker while the cheap factors run here
+        if summary is not None:
+            feature_vars = summary.feature_vars
+        elif spectral_result is not None:
+            feature_vars = spectral_result.feature_vars
+        else:
+            feature_vars = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            collapse_future = executor.submit(
+                self._compute_collapse_risk, flat_data, feature_vars
+            )
+
+            # 1. Overfit Potential
+            risk_factors["overfit_potential"] = self._compute_overfit_risk(
+                flat_data, labels
+            )
 
-        # 2. Representation Collapse
-        risk_factors["representation_collapse"] = self._compute_collapse_risk(flat_data)
+            # 3. Class Boundary Distortion
+            boundary_risk = self._compute_boundary_risk(flat_data, labels, label_stats)
 
-        # 3. Class Boundary Distortion
-        risk_factors["class_boundary_distortion"] = self._compute_boundary_risk(
-            flat_data, labels
-        )
+            # 2. Representation Collapse
+            risk_factors["representation_collapse"] = collapse_future.result()
+        risk_factors["class_boundary_distortion"] = boundary_risk
 
         # 4. Poisoning Density
         if poisoning_info:
@@ -86,10 +117,12 @@ class CollapseRiskEngine:
             risk_factors["trigger_confidence"] = 0.0
 
         # Compute weighted score
-        collapse_risk_score = sum(
-            risk_factors[k] * self.risk_weights[k] * 100 for k in self.risk_weights
+        factor_vec = np.fromiter(
+            (risk_factors[k] for k in self._risk_keys),
+            dtype=np.float64,
+            count=len(self._risk_keys),
         )
-        collapse_risk_score = min(100, max(0, collapse_risk_score))
+        collapse_risk_score = float(np.clip(factor_vec @ self._score_weights, 0, 100))
 
         # Determine risk level
         risk_level = self._get_risk_level(collapse_risk_score)
@@ -128,17 +161,20 @@ class CollapseRiskEngine:
 
         return min(1.0, risk)
 
-    def _compute_collapse_risk(self, data: np.ndarray) -> float:
+    def _compute_collapse_risk(
+        self, data: np.ndarray, feature_vars: Optional[np.ndarray] = None
+    ) -> float:
         """Compute representation collapse risk."""
         # Check variance across features
-        feature_vars = data.var(axis=0)
+        if feature_vars is None:
+            feature_vars = data.var(axis=0)
         low_var_ratio = (feature_vars < 0.01).sum() / len(feature_vars)
 
         # Check effective rank
         try:
-            U, s, Vt = np.linalg.svd(data[: min(1000, len(data))], full_matrices=False)
-            total_var = (s**2).sum()
-            cumvar = np.cumsum(s**2) / total_var
+            s_sq = self._squared_singular_values(data[: min(1000, len(data))])
+            total_var = s_sq.sum()
+            cumvar = np.cumsum(s_sq) / total_var
             effective_rank = np.searchsorted(cumvar, 0.95) + 1
             rank_ratio = float(effective_rank / min(data.shape))
         except Exception:
@@ -147,22 +183,49 @@ class CollapseRiskEngine:
         risk = low_var_ratio * 0.5 + (1 - rank_ratio) * 0.5
         return min(1.0, risk)
 
-    def _compute_boundary_risk(self, data: np.ndarray, labels: np.ndarray) -> float:
+    @staticmethod
+    def _squared_singular_values(sample: np.ndarray) -> np.ndarray:
+        """Return squared singular values of sample in descending order."""
+        # The squared singular values are the eigenvalues of the smaller Gram
+        # matrix, and a symmetric eigensolve on it is far cheaper than an SVD.
+        # Truncated solvers (svds) do not pay off: on a 1000-row sample their
+        # Lanczos restarts cost several times this Gram product plus eigvalsh
+        x = sample.astype(np.float64, copy=False)
+        gram = x.T @ x if x.shape[1] <= x.shape[0] else x @ x.T
+        try:
+            eigvals = np.linalg.eigvalsh(gram)[::-1]
+        except np.linalg.LinAlgError:
+            return np.linalg.svd(x, compute_uv=False) ** 2
+        # Rounding can leave tiny negative eigenvalues for a rank-deficient X
+        return np.clip(eigvals, 0.0, None)
+
+    def _compute_boundary_risk(
+        self,
+        data: np.ndarray,
+        labels: np.ndarray,
+        label_stats: Optional[LabelStats] = None,
+    ) -> float:
         """Compute class boundary distortion risk."""
         try:
             # Simple heuristic for boundary distortion
             # Measure overlap between class distributions
-            unique_labels = np.unique(labels)
-            if len(unique_labels) < 2:
+            # All class centroids from one pass over the data, unless shared
+            if label_stats is None or label_stats.centroids is None:
+                label_stats = LabelStats.from_data(data, labels)
+            if label_stats.n_classes < 2:
                 return 0.0
 
-            centroid_list = []
-            for label in unique_labels:
-                centroid_list.append(np.mean(data[labels == label], axis=0))
-
-            centroids = np.array(centroid_list)
-            # Average distance between centroids
-            dists = np.linalg.norm(centroids[:, None] - centroids, axis=2)
+            # Average distance between centroids, from the K x K Gram matrix
+            # (||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b) rather than a K x K x D
+            # difference tensor. The product is only K x K, so float64 costs
+            # nothing and keeps the expansion from cancelling to noise when
+            # centroids nearly coincide
+            centroids = label_stats.centroids.astype(np.float64)
+            sq_norms = np.einsum("kd,kd->k", centroids, centroids)
+            sq_dists = sq_norms[:, None] + sq_norms[None, :]
+            sq_dists -= 2.0 * (centroids @ centroids.T)
+            upper = np.triu_indices(label_stats.n_classes, 1)
+            dists = np.sqrt(np.maximum(sq_dists[upper], 0.0))
             avg_dist = float(np.mean(dists[dists > 0]))
 
             # Normalize (heuristic)
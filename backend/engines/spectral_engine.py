@@ -4,21 +4,33 @@ Spectral Signatures Engine.
 Implements spectral signatures analysis for poisoning detection.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy as np
-from scipy import stats
-from sklearn.decomposition import PCA, TruncatedSVD
-from sklearn.preprocessing import StandardScaler
+from scipy import linalg
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh
 
 from backend.utils import get_logger
 
+from ._preprocess import DatasetSummary, ensure_flat
+
 logger = get_logger("spectral_engine")
 
 
 class SpectralResult:
     """Result of spectral signatures analysis."""
 
+    # Fixed attribute set: no per-instance __dict__
+    __slots__ = (
+        "poisoning_score",
+        "suspected_indices",
+        "outlier_scores",
+        "singular_values",
+        "analysis_details",
+        "feature_means",
+        "feature_vars",
+    )
+
     def __init__(
         self,
         poisoning_score: float,
@@ -26,6 +38,8 @@ class SpectralResult:
         outlier_scores: np.ndarray,
         singular_values: np.ndarray,
         analysis_details: Dict[str, Any],
+        feature_means: Optional[np.ndarray] = None,
+        feature_vars: Optional[np.ndarray] = None,
     ):
         """Initialize result."""
         self.poisoning_score = poisoning_score
@@ -33,6 +47,9 @@ class SpectralResult:
         self.outlier_scores = outlier_scores
         self.singular_values = singular_values
         self.analysis_details = analysis_details
+        # Raw per-feature moments of the analyzed data, for reuse downstream
+        self.feature_means = feature_means
+        self.feature_vars = feature_vars
 
 
 class SpectralSignaturesDetector:
@@ -40,7 +57,8 @@ class SpectralSignaturesDetector:
     Detects poisoned samples using spectral signatures.
 
     Based on the principle that poisoned samples often form a separable
-    subspace in the feature representation.
+    subspace in the feature representation. ``analyze`` keeps no state on the
+    instance, so a single detector may serve concurrent requests.
     """
 
     def __init__(self, n_components: int = 10, detection_threshold: float = 2.0):
@@ -54,13 +72,19 @@ class SpectralSignaturesDetector:
         self.n_components = n_components
         self.detection_threshold = detection_threshold
 
-    def analyze(self, data: np.ndarray, labels: np.ndarray) -> SpectralResult:
+    def analyze(
+        self,
+        data: np.ndarray,
+        labels: np.ndarray,
+        summary: Optional[DatasetSummary] = None,
+    ) -> SpectralResult:
         """
         Perform spectral signatures analysis.
 
         Args:
             data: Feature matrix (n_samples, n_features).
             labels: Label array (n_samples,).
+            summary: Precomputed moments and class layout of (data, labels).
 
         Returns:
             SpectralResult containing scores and suspected indices.
@@ -68,48 +92,73 @@ class SpectralSignaturesDetector:
         logger.info(f"Starting spectral analysis on {len(data)} samples")
 
         # Flatten image data if needed
-        if len(data.shape) > 2:
-            flat_data = data.reshape(data.shape[0], -1)
-        else:
-            flat_data = data
-
-        # Normalize data
-        scaler = StandardScaler()
-        normalized_data = scaler.fit_transform(flat_data)
-
-        # Compute SVD
-        # Use RandomizedSVD (via TruncatedSVD) for efficiency on large datasets
-        svd = TruncatedSVD(
-            n_components=min(self.n_components, flat_data.shape[1] - 1), random_state=42
+        flat_data = ensure_flat(data)
+
+        if summary is None:
+            summary = DatasetSummary.from_data(flat_data, labels)
+
+        # Standardization statistics; the SVD applies them implicitly
+        dtype = np.float32 if flat_data.dtype == np.float32 else np.float64
+        feature_means, feature_vars = summary.feature_means, summary.feature_vars
+        # StandardScaler's scale: columns within the two-pass variance error
+        # bound of a constant (the rounded mean leaves residue) get 1
+        n, eps = len(flat_data), np.finfo(np.float64).eps
+        bound = n * eps * feature_vars + (n * eps * feature_means) ** 2
+        scale = np.sqrt(feature_vars)
+        scale[feature_vars <= bound] = 1.0
+        mu, scale = feature_means.astype(dtype), scale.astype(dtype)
+
+        # Randomized SVD of the implicitly standardized data
+        singular_values = _standardized_singular_values(
+            flat_data,
+            mu,
+            scale,
+            n_components=min(self.n_components, flat_data.shape[1] - 1),
         )
-        svd.fit(normalized_data)
-        singular_values = svd.singular_values_
 
         # Analyze per class
         suspected_indices: List[int] = []
         outlier_scores = np.zeros(len(data))
         details: Dict[str, Any] = {}
 
-        unique_labels = np.unique(labels)
-        for label in unique_labels:
-            class_mask = labels == label
-            class_indices = np.where(class_mask)[0]
-            class_data = normalized_data[class_mask]
+        # Samples partitioned by class in one stable sort are standardized
+        # into a single label-ordered buffer, so every class is a contiguous
+        # slice that can be centered in place
+        order = summary.order
+        unique_labels, starts = summary.classes, summary.class_starts
+        ends = np.r_[starts[1:], len(labels)]
+        # The gather is the only full-size allocation; standardization runs
+        # in place on it
+        standardized = flat_data[order].astype(dtype, copy=False)
+        standardized -= mu
+        standardized /= scale
+
+        for label, start, end in zip(unique_labels, starts, ends):
+            class_indices = order[start:end]
+            class_data = standardized[start:end]
 
             if len(class_data) < 5:
                 continue
 
-            # Compute class mean
-            class_mean = np.mean(class_data, axis=0)
-            centered_data = class_data - class_mean
+            # Center on the class mean
+            class_data -= np.mean(class_data, axis=0)
 
             # Project onto top singular vector of the class
-            pca = PCA(n_components=1, random_state=42)
-            projections = pca.fit_transform(centered_data).flatten()
+            projections = _top1_projection(class_data)
 
             # Calculate outlier scores (distance from center in projection)
             scores = np.abs(projections)
-            z_scores = np.abs(stats.zscore(scores))
+
+            # Population z-score of scores, inlined; the std comes from the
+            # centered deviations, so large scores do not cancel it away
+            mean_score = scores.mean()
+            z_scores = np.abs(scores - mean_score)
+            std_score = np.sqrt(np.dot(z_scores, z_scores) / len(z_scores))
+            # A spread of a few ulps is centering residue of a constant class
+            if std_score > 4 * np.finfo(z_scores.dtype).eps * mean_score:
+                z_scores /= std_score
+            else:
+                z_scores[:] = 0.0  # Constant scores carry no outliers
 
             # Flag outliers
             outliers = np.where(z_scores > self.detection_threshold)[0]
@@ -124,6 +173,11 @@ class SpectralSignaturesDetector:
                 "n_suspected": len(outliers),
             }
 
+        # Results may be shared through the result cache; guard the arrays
+        # against in-place edits by callers
+        for array in (outlier_scores, singular_values, feature_means, feature_vars):
+            array.flags.writeable = False
+
         # Calculate overall poisoning score (0-100)
         poison_ratio = len(suspected_indices) / len(data) if len(data) > 0 else 0
         poisoning_score = min(100.0, poison_ratio * 500)  # Scale up for visibility
@@ -134,4 +188,99 @@ class SpectralSignaturesDetector:
             outlier_scores=outlier_scores,
             singular_values=singular_values,
             analysis_details=details,
+            feature_means=feature_means,
+            feature_vars=feature_vars,
         )
+
+
+def _top1_projection(centered: np.ndarray) -> np.ndarray:
+    """
+    Project rows onto the top singular direction (sign is arbitrary).
+
+    Only the leading eigenpair of the smaller Gram matrix is computed, by a
+    subset eigensolve when it is small and Lanczos iteration otherwise,
+    instead of a full PCA/SVD of the class.
+
+    Args:
+        centered: Column-centered matrix (n_samples, n_features).
+
+    Returns:
+        Array of n_samples projections.
+    """
+    n, p = centered.shape
+    # For n < p the projections are sqrt(w) * u with (w, u) the top
+    # eigenpair of X X^T; otherwise project X onto the top eigenvector of
+    # X^T X
+    by_row = n < p
+    gram = centered @ centered.T if by_row else centered.T @ centered
+    m = len(gram)
+    vec = None
+    if m > 256:
+        try:
+            # Deterministic start vector keeps results reproducible
+            w, vec = eigsh(gram, k=1, v0=np.ones(m, dtype=gram.dtype))
+        except ArpackNoConvergence:
+            vec = None
+    if vec is None:
+        w, vec = linalg.eigh(gram, subset_by_index=[m - 1, m - 1])
+
+    if by_row:
+        return vec[:, 0] * np.sqrt(max(float(w[0]), 0.0))
+    return centered @ vec[:, 0]
+
+
+def _standardized_singular_values(
+    data: np.ndarray,
+    mu: np.ndarray,
+    scale: np.ndarray,
+    n_components: int,
+    n_iter: int = 5,
+    n_oversamples: int = 10,
+    random_state: int = 42,
+) -> np.ndarray:
+    """
+    Top singular values of (data - mu) / scale by randomized SVD.
+
+    Mirrors sklearn's randomized_svd (Halko et al., LU-normalized power
+    iterations) but applies the standardization inside each product, so the
+    normalized copy of ``data`` is never formed.
+
+    Args:
+        data: Matrix (n_samples, n_features).
+        mu: Column means.
+        scale: Column scales.
+        n_components: Number of singular values to return.
+        n_iter: Power iterations.
+        n_oversamples: Extra random vectors for the range finder.
+        random_state: Seed for the random test matrix.
+
+    Returns:
+        Descending array of the top ``n_components`` singular values.
+    """
+
+    def forward(q: np.ndarray) -> np.ndarray:
+        # A @ q with A = (X - 1 mu^T) diag(1 / scale)
+        q_scaled = q / scale[:, None]
+        return data @ q_scaled - mu @ q_scaled
+
+    def adjoint(p: np.ndarray) -> np.ndarray:
+        # A^T @ p
+        return (data.T @ p - np.outer(mu, p.sum(axis=0))) / scale[:, None]
+
+    # Like sklearn, work on the transpose when it has fewer columns
+    if data.shape[0] < data.shape[1]:
+        forward, adjoint = adjoint, forward
+        n_cols = data.shape[0]
+    else:
+        n_cols = data.shape[1]
+
+    rng = np.random.RandomState(random_state)
+    q = rng.normal(size=(n_cols, n_components + n_oversamples)).astype(mu.dtype)
+    for _ in range(n_iter):
+        q = linalg.lu(forward(q), permute_l=True, check_finite=False)[0]
+        q = linalg.lu(adjoint(q), permute_l=True, check_finite=False)[0]
+    q = linalg.qr(forward(q), mode="economic", check_finite=False)[0]
+
+    # Singular values of the thin (k + p) projection Q^T M
+    s = linalg.svd(adjoint(q).T, compute_uv=False, check_finite=False)
+    return s[:n_components]
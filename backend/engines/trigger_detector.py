@@ -4,7 +4,7 @@ Trigger Pattern Detector.
 Detects synthetic backdoor triggers in images, text, and tabular data.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -13,9 +13,24 @@ from backend.utils import get_logger
 logger = get_logger("trigger_detector")
 
 
+def _dominant_class(class_ids: np.ndarray, n_classes: int) -> Tuple[int, float]:
+    """Return the most frequent class id and its share, via one bincount."""
+    counts = np.bincount(class_ids, minlength=n_classes)
+    top = int(counts.argmax())
+    return top, counts[top] / counts.sum()
+
+
 class TriggerResult:
     """Result of trigger detection analysis."""
 
+    # Fixed attribute set: no per-instance __dict__
+    __slots__ = (
+        "poisoning_score",
+        "detected_triggers",
+        "suspicious_patterns",
+        "trigger_heatmap",
+    )
+
     def __init__(
         self,
         poisoning_score: float,
@@ -51,23 +66,48 @@ class ImageTriggerDetector:
         detected_triggers = []
         suspicious_indices = []
 
+        # Summed-area table of the per-pixel channel means, zero-padded so
+        # every patch mean is four lookups; float64 keeps the box differences
+        # accurate. Single-channel images are accumulated straight from the
+        # input, with no channel-mean copy
+        integral = np.zeros((n_samples, h + 1, w + 1))
+        pixel_means = (
+            images[..., 0] if c == 1 else images.mean(axis=3, dtype=np.float64)
+        )
+        np.cumsum(pixel_means, axis=1, dtype=np.float64, out=integral[:, 1:, 1:])
+        np.cumsum(integral[:, 1:, 1:], axis=2, out=integral[:, 1:, 1:])
+
+        # One-hot class matrix turns per-location label histograms of the
+        # high-intensity samples into a single matrix product
+        classes, class_ids = np.unique(labels, return_inverse=True)
+        one_hot = np.zeros((len(classes), n_samples), dtype=np.float32)
+        one_hot[class_ids.ravel(), np.arange(n_samples)] = 1.0
+
         # Scan for patch-based triggers
         for patch_size in self.patch_sizes:
-            for i in range(h - patch_size + 1):
-                for j in range(w - patch_size + 1):
-                    patches = images[:, i : i + patch_size, j : j + patch_size, :]
-                    result = self._analyze_patch(patches, labels, i, j, patch_size)
-                    if result:
-                        detected_triggers.append(result)
-                        trigger_heatmap[i : i + patch_size, j : j + patch_size] += 1
-                        suspicious_indices.extend(result.get("sample_indices", []))
+            if patch_size > min(h, w):
+                continue  # No patch location fits the image
+            for result in self._scan_patches(integral, one_hot, classes, patch_size):
+                i, j = result["location"]
+                detected_triggers.append(result)
+                trigger_heatmap[i : i + patch_size, j : j + patch_size] += 1
+                suspicious_indices.extend(result.get("sample_indices", []))
 
         # Check corner regions specifically (common trigger location)
         corners = [(0, 0), (0, w - 5), (h - 5, 0), (h - 5, w - 5)]
         for ci, cj in corners:
-            if ci + 5 <= h and cj + 5 <= w:
-                corner_patches = images[:, ci : ci + 5, cj : cj + 5, :]
-                result = self._analyze_corner(corner_patches, labels, ci, cj)
+            # The whole 5x5 block must fit: the summed-area lookups cannot
+            # serve a corner that runs past the image or starts before it
+            if 0 <= ci and ci + 5 <= h and 0 <= cj and cj + 5 <= w:
+                # Patch means come from the summed-area table; only the second
+                # moment needs the (un-copied) corner block itself
+                block = images[:, ci : ci + 5, cj : cj + 5, :]
+                mean = self._box_mean(integral, ci, cj, 5)
+                sq_mean = np.einsum("nijc,nijc->n", block, block, dtype=np.float64) / (
+                    25 * c
+                )
+                std_per_sample = np.sqrt(np.maximum(sq_mean - mean**2, 0.0))
+                result = self._analyze_corner(std_per_sample, ci, cj)
                 if result:
                     detected_triggers.append(result)
                     trigger_heatmap[ci : ci + 5, cj : cj + 5] += 2
@@ -85,43 +125,65 @@ class ImageTriggerDetector:
             ],
         )
 
-    def _analyze_patch(
-        self, patches: np.ndarray, labels: np.ndarray, row: int, col: int, size: int
-    ) -> Optional[Dict[str, Any]]:
-        """Analyze a patch region for trigger patterns."""
-        flat_patches = patches.reshape(len(patches), -1)
+    def _scan_patches(
+        self,
+        integral: np.ndarray,
+        one_hot: np.ndarray,
+        classes: np.ndarray,
+        size: int,
+    ) -> List[Dict[str, Any]]:
+        """Analyze every size x size patch location for trigger patterns."""
+        n_samples = integral.shape[0]
 
-        # Check for high-intensity uniform patches
-        mean_intensity = flat_patches.mean(axis=1)
-        high_intensity_mask = mean_intensity > self.intensity_threshold
+        # Mean intensity of every patch of every sample, (n, rows, cols),
+        # accumulated in one buffer so the sweep streams no extra temporaries
+        mean_intensity = integral[:, size:, size:] - integral[:, :-size, size:]
+        mean_intensity -= integral[:, size:, :-size]
+        mean_intensity += integral[:, :-size, :-size]
+        mean_intensity /= size * size
+        n_cols = mean_intensity.shape[2]
 
-        if high_intensity_mask.sum() < 5:
-            return None
+        # Check for high-intensity uniform patches
+        high_intensity = mean_intensity > self.intensity_threshold
+        flat_high = high_intensity.reshape(n_samples, -1)
+        n_high = np.count_nonzero(flat_high, axis=0)
 
         # Check if high-intensity samples have unusual label distribution
-        high_labels = labels[high_intensity_mask]
-        unique, counts = np.unique(high_labels, return_counts=True)
-
-        if len(unique) > 0:
-            dominant_ratio = counts.max() / counts.sum()
-            if dominant_ratio > 0.8 and high_intensity_mask.sum() >= 5:
-                return {
+        class_counts = one_hot @ flat_high.astype(np.float32)
+        dominant_ratio = class_counts.max(axis=0) / np.maximum(n_high, 1)
+        candidates = np.flatnonzero((n_high >= 5) & (dominant_ratio > 0.8))
+
+        results = []
+        for flat_idx in candidates:
+            row, col = divmod(int(flat_idx), n_cols)
+            mask = flat_high[:, flat_idx]
+            results.append(
+                {
                     "type": "pixel_trigger",
                     "location": (row, col),
                     "size": size,
-                    "intensity": float(mean_intensity[high_intensity_mask].mean()),
-                    "dominant_label": int(unique[counts.argmax()]),
-                    "sample_indices": np.where(high_intensity_mask)[0].tolist()[:10],
+                    "intensity": float(mean_intensity[mask, row, col].mean()),
+                    "dominant_label": int(classes[class_counts[:, flat_idx].argmax()]),
+                    "sample_indices": np.flatnonzero(mask)[:10].tolist(),
                 }
-        return None
+            )
+        return results
+
+    @staticmethod
+    def _box_mean(integral: np.ndarray, row: int, col: int, size: int) -> np.ndarray:
+        """Per-sample mean of one size x size patch from a summed-area table."""
+        box = (
+            integral[:, row + size, col + size]
+            - integral[:, row, col + size]
+            - integral[:, row + size, col]
+            + integral[:, row, col]
+        )
+        return box / (size * size)
 
     def _analyze_corner(
-        self, patches: np.ndarray, labels: np.ndarray, row: int, col: int
+        self, std_per_sample: np.ndarray, row: int, col: int
     ) -> Optional[Dict[str, Any]]:
-        """Specifically analyze corner regions."""
-        flat_patches = patches.reshape(len(patches), -1)
-        std_per_sample = flat_patches.std(axis=1)
-
+        """Specifically analyze corner regions from per-sample patch std."""
         # Low variance = uniform patch = potential trigger
         low_var_mask = std_per_sample < 0.1
         if low_var_mask.sum() >= 5:
@@ -157,15 +219,19 @@ class TextTriggerDetector:
 
         n_samples, seq_len = texts.shape
 
+        # Contiguous class ids let label dominance be counted with bincount
+        classes, class_ids = np.unique(labels, return_inverse=True)
+        class_ids = class_ids.ravel()
+
         # Check for rare token sequences at end (common trigger placement)
         for pos in [seq_len - 3, seq_len - 2, seq_len - 1]:
             if pos >= 0:
-                result = self._check_position(texts, labels, pos)
+                result = self._check_position(texts, class_ids, classes, pos)
                 if result:
                     detected_triggers.append(result)
 
         # Check for repeated subsequences
-        repeated_result = self._check_repeated_patterns(texts, labels)
+        repeated_result = self._check_repeated_patterns(texts, class_ids, classes)
         detected_triggers.extend(repeated_result)
 
         poisoning_score = self._compute_score(detected_triggers)
@@ -180,7 +246,7 @@ class TextTriggerDetector:
         )
 
     def _check_position(
-        self, texts: np.ndarray, labels: np.ndarray, pos: int
+        self, texts: np.ndarray, class_ids: np.ndarray, classes: np.ndarray, pos: int
     ) -> Optional[Dict[str, Any]]:
         """Check specific position for trigger tokens."""
         tokens_at_pos = texts[:, pos]
@@ -190,54 +256,66 @@ class TextTriggerDetector:
         for token, count in zip(unique_tokens, counts):
             if count >= self.min_pattern_freq and token > 900:  # Rare token range
                 token_mask = tokens_at_pos == token
-                token_labels = labels[token_mask]
-                unique_labels, label_counts = np.unique(
-                    token_labels, return_counts=True
+                top, dominant_ratio = _dominant_class(
+                    class_ids[token_mask], len(classes)
                 )
-
-                if len(unique_labels) > 0:
-                    dominant_ratio = label_counts.max() / label_counts.sum()
-                    if dominant_ratio > 0.7:
-                        return {
-                            "type": "token_trigger",
-                            "position": pos,
-                            "token_id": int(token),
-                            "frequency": int(count),
-                            "dominant_label": int(unique_labels[label_counts.argmax()]),
-                        }
+                if dominant_ratio > 0.7:
+                    return {
+                        "type": "token_trigger",
+                        "position": pos,
+                        "token_id": int(token),
+                        "frequency": int(count),
+                        "dominant_label": int(classes[top]),
+                    }
         return None
 
     def _check_repeated_patterns(
-        self, texts: np.ndarray, labels: np.ndarray
+        self, texts: np.ndarray, class_ids: np.ndarray, classes: np.ndarray
     ) -> List[Dict[str, Any]]:
         """Check for repeated suspicious patterns."""
-        triggers = []
-        len(texts)
+        triggers: List[Dict[str, Any]] = []
 
         # Check last 5 tokens as potential trigger sequence
-        if texts.shape[1] >= 5:
-            last_5 = texts[:, -5:]
-            pattern_map: Dict[tuple, List[int]] = {}
-
-            for i, pattern in enumerate(last_5):
-                key = tuple(pattern.tolist())
-                if key not in pattern_map:
-                    pattern_map[key] = []
-                pattern_map[key].append(i)
-
-            for pattern, indices in pattern_map.items():
-                if len(indices) >= self.min_pattern_freq:
-                    pattern_labels = labels[indices]
-                    unique, counts = np.unique(pattern_labels, return_counts=True)
-                    if len(unique) > 0 and counts.max() / counts.sum() > 0.8:
-                        triggers.append(
-                            {
-                                "type": "sequence_trigger",
-                                "pattern": list(pattern),
-                                "frequency": len(indices),
-                                "dominant_label": int(unique[counts.argmax()]),
-                            }
-                        )
+        if texts.shape[1] < 5:
+            return triggers
+        last_5 = texts[:, -5:]
+
+        # Group identical windows: pack each into one exact uint64 key when
+        # every token is a finite integer and the range allows, otherwise
+        # compare rows directly
+        bits = 65
+        if np.isfinite(last_5).all() and np.array_equal(last_5, np.round(last_5)):
+            offsets = last_5 - last_5.min()
+            bits = int(offsets.max()).bit_length()
+        if 5 * bits <= 64:
+            shifts = np.arange(5, dtype=np.uint64)[::-1] * np.uint64(bits)
+            keys = np.bitwise_or.reduce(offsets.astype(np.uint64) << shifts, axis=1)
+            _, group_ids = np.unique(keys, return_inverse=True)
+        else:
+            _, group_ids = np.unique(last_5, axis=0, return_inverse=True)
+        group_ids = group_ids.ravel()
+
+        # Members of each group as ascending slices of one stable sort
+        order = np.argsort(group_ids, kind="stable")
+        group_sizes = np.bincount(group_ids)
+        starts = np.r_[0, np.cumsum(group_sizes)[:-1]]
+
+        # Report groups in order of first occurrence, as rows are scanned
+        frequent = np.flatnonzero(group_sizes >= self.min_pattern_freq)
+        frequent = frequent[np.argsort(order[starts[frequent]])]
+
+        for group in frequent:
+            indices = order[starts[group] : starts[group] + group_sizes[group]]
+            top, dominant_ratio = _dominant_class(class_ids[indices], len(classes))
+            if dominant_ratio > 0.8:
+                triggers.append(
+                    {
+                        "type": "sequence_trigger",
+                        "pattern": last_5[indices[0]].tolist(),
+                        "frequency": len(indices),
+                        "dominant_label": int(classes[top]),
+                    }
+                )
         return triggers
 
     def _compute_score(self, triggers: List[Dict]) -> float:
@@ -247,7 +325,12 @@ class TextTriggerDetector:
 
 
 class UniversalTriggerDetector:
-    """Universal trigger detector for any data type."""
+    """
+    Universal trigger detector for any data type.
+
+    Holds only configured sub-detectors, none of which keep per-call state,
+    so an instance is safe to reuse from multiple threads.
+    """
 
     def __init__(self) -> None:
         self.image_detector = ImageTriggerDetector()
@@ -268,24 +351,35 @@ class UniversalTriggerDetector:
     def _detect_tabular(self, data: np.ndarray, labels: np.ndarray) -> TriggerResult:
         """Detect triggers in tabular data."""
         detected = []
-
-        # Check for extreme values in specific columns
-        for col in range(data.shape[1]):
-            col_data = data[:, col]
-            z_scores = np.abs((col_data - col_data.mean()) / (col_data.std() + 1e-8))
-            extreme_mask = z_scores > 3
-
-            if extreme_mask.sum() >= 5:
-                extreme_labels = labels[extreme_mask]
-                unique, counts = np.unique(extreme_labels, return_counts=True)
-                if counts.max() / counts.sum() > 0.8:
-                    detected.append(
-                        {
-                            "type": "extreme_value_trigger",
-                            "column": col,
-                            "n_samples": int(extreme_mask.sum()),
-                        }
-                    )
+        classes, class_ids = np.unique(labels, return_inverse=True)
+        class_ids = class_ids.ravel()
+
+        # Check for extreme values in specific columns, all at once: rows of
+        # the transposed copy reduce exactly like the per-column 1-D slices
+        dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.float64
+        columns = np.array(data.T, dtype=dtype, order="C")
+        means = columns.mean(axis=1, keepdims=True)
+        stds = columns.std(axis=1, keepdims=True)
+        # z-scores in place; columns is always a private copy
+        columns -= means
+        columns /= stds + 1e-8
+        extreme = np.abs(columns, out=columns) > 3
+        n_extreme = np.count_nonzero(extreme, axis=1)
+
+        # Label histogram of each column's extreme samples as one product
+        one_hot = np.zeros((len(class_ids), len(classes)), dtype=np.float32)
+        one_hot[np.arange(len(class_ids)), class_ids] = 1.0
+        top_counts = (extreme.astype(np.float32) @ one_hot).max(axis=1)
+        dominant_ratio = top_counts.astype(np.int64) / np.maximum(n_extreme, 1)
+
+        for col in np.flatnonzero((n_extreme >= 5) & (dominant_ratio > 0.8)):
+            detected.append(
+                {
+                    "type": "extreme_value_trigger",
+                    "column": int(col),
+                    "n_samples": int(n_extreme[col]),
+                }
+            )
 
         return TriggerResult(
             poisoning_score=min(100, len(detected) * 15),
@@ -13,6 +13,7 @@ from typing import Any, Dict, Union
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
@@ -60,6 +61,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Index lists and report HTML compress well; level 1 keeps CPU cost low
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 # Register routers
 app.include_router(scan_router)
 app.include_router(poison_router)
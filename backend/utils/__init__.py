@@ -3,9 +3,12 @@
 from .hash_utils import (
     FingerprintLog,
     compute_array_hash,
+    compute_array_hash_parallel,
     compute_dataset_fingerprint,
     compute_file_hash,
+    compute_sampled_array_hash,
     compute_sha256,
+    has_frozen_buffer,
     verify_fingerprint,
 )
 from .logger import get_logger, logger, setup_logger
@@ -15,8 +18,11 @@ __all__ = [
     "get_logger",
     "setup_logger",
     "compute_sha256",
+    "has_frozen_buffer",
     "compute_file_hash",
     "compute_array_hash",
+    "compute_array_hash_parallel",
+    "compute_sampled_array_hash",
     "compute_dataset_fingerprint",
     "verify_fingerprint",
     "FingerprintLog",
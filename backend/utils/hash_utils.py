@@ -7,18 +7,61 @@ and provenance tracking.
 
 import hashlib
 import json
+import mmap
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
+import orjson
 
+# Tree hash: fixed-size slabs keep the digest independent of the worker count
+TREE_HASH_MODE = "tree_sha256_v1"
+TREE_HASH_SLAB_SIZE = 4 << 20
 
-def compute_sha256(data: bytes) -> str:
+# Digests of read-only arrays keyed by id; a weakref finalizer drops an
+# entry when its array dies, so an id is never matched to a new array
+_HASH_CACHE: "OrderedDict[int, str]" = OrderedDict()
+_HASH_CACHE_SIZE = 64
+_HASH_LOCK = threading.Lock()
+
+
+def has_frozen_buffer(array: np.ndarray) -> bool:
+    """
+    Check whether an array's bytes cannot change through any reference.
+
+    Read-only alone is not enough: a read-only view of a writable base
+    still changes when the base is edited. The array must be read-only and
+    its data owned by a read-only ndarray, found by walking ``base``.
+
+    Args:
+        array: NumPy array to check
+
+    Returns:
+        True if the array may be cached by identity
+    """
+    if array.flags.writeable:
+        return False
+    owner = array
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    # Foreign buffers (bytes, mmap, ...) are not tracked by NumPy flags
+    return owner.base is None and not owner.flags.writeable
+
+
+def compute_sha256(data: Union[bytes, memoryview, np.ndarray]) -> str:
     """
     Compute SHA-256 hash of binary data.
 
+    hashlib dispatches to OpenSSL's EVP digest, which selects the SHA-NI
+    (or AVX2) code path itself from CPUID, so no engine setup is needed.
+
     Args:
-        data: Binary data to hash
+        data: Binary data or any C-contiguous buffer to hash
 
     Returns:
         Hexadecimal hash string
@@ -26,6 +69,14 @@ def compute_sha256(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def _byte_view(array: np.ndarray) -> np.ndarray:
+    """Return the C-order bytes of array as flat uint8, copying only if needed."""
+    if array.dtype.hasobject:
+        # Object buffers hold pointers; keep tobytes semantics for them
+        return np.frombuffer(array.tobytes(), dtype=np.uint8)
+    return np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+
+
 def compute_file_hash(file_path: Path) -> str:
     """
     Compute SHA-256 hash of a file.
@@ -38,8 +89,24 @@ def compute_file_hash(file_path: Path) -> str:
     """
     sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256_hash.update(chunk)
+        # Map the file so the digest reads the page cache directly in one
+        # update (hashlib releases the GIL while it runs)
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                sha256_hash.update(mapped)
+            return sha256_hash.hexdigest()
+        except (OSError, ValueError):
+            pass  # Empty or unmappable (e.g. a pipe); stream it instead
+
+        # Large chunks read into one reused buffer instead of a bytes object
+        # per small read
+        buffer = bytearray(1 << 20)
+        view = memoryview(buffer)
+        while True:
+            n_read = f.readinto(buffer)
+            if not n_read:
+                break
+            sha256_hash.update(view[:n_read])
     return sha256_hash.hexdigest()
 
 
@@ -53,11 +120,106 @@ def compute_array_hash(array: np.ndarray) -> str:
     Returns:
         Hexadecimal hash string
     """
-    return compute_sha256(array.tobytes())
+    # Only arrays whose buffer cannot change (e.g. from generate_dataset)
+    # are memoized; checked on every call, so hits are re-validated too
+    if not has_frozen_buffer(array):
+        return compute_sha256(_byte_view(array))
+
+    key = id(array)
+    with _HASH_LOCK:
+        digest = _HASH_CACHE.get(key)
+        if digest is not None:
+            _HASH_CACHE.move_to_end(key)
+            return digest
+
+    # Hash the array's own buffer rather than a tobytes() copy of it
+    digest = compute_sha256(_byte_view(array))
+    with _HASH_LOCK:
+        if key not in _HASH_CACHE:
+            weakref.finalize(array, _evict_hash, key)
+        _HASH_CACHE[key] = digest
+        _HASH_CACHE.move_to_end(key)
+        while len(_HASH_CACHE) > _HASH_CACHE_SIZE:
+            _HASH_CACHE.popitem(last=False)
+    return digest
+
+
+def _evict_hash(key: int) -> None:
+    with _HASH_LOCK:
+        _HASH_CACHE.pop(key, None)
+
+
+def compute_array_hash_parallel(
+    array: np.ndarray, max_workers: Optional[int] = None
+) -> str:
+    """
+    Compute a tree hash of a NumPy array, hashing slabs on several cores.
+
+    The C-order buffer is split into fixed TREE_HASH_SLAB_SIZE slabs whose
+    SHA-256 digests are hashed again in order. hashlib releases the GIL on
+    large updates, so slabs hash in parallel threads. The result differs
+    from compute_array_hash and is identified by TREE_HASH_MODE.
+
+    Args:
+        array: NumPy array to hash
+        max_workers: Hashing threads (defaults to the CPU count)
+
+    Returns:
+        Hexadecimal hash string
+    """
+    buffer = _byte_view(array)
+    starts = range(0, max(len(buffer), 1), TREE_HASH_SLAB_SIZE)
+    slabs = [buffer[start : start + TREE_HASH_SLAB_SIZE] for start in starts]
+
+    workers = min(max_workers or os.cpu_count() or 1, len(slabs))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            digests = list(
+                executor.map(lambda slab: hashlib.sha256(slab).digest(), slabs)
+            )
+    else:
+        digests = [hashlib.sha256(slab).digest() for slab in slabs]
+    return compute_sha256(b"".join(digests))
+
+
+def compute_sampled_array_hash(array: np.ndarray, stripe_size: int = 4096) -> str:
+    """
+    Compute a hash of a NumPy array from a few fixed byte stripes.
+
+    Hashes the shape, dtype and size together with the first, last and one
+    middle stripe of the raw buffer. The middle offset is derived from the
+    number of rows, so it is stable for a given shape. This is a cheap
+    change detector for very large arrays, not an integrity guarantee.
+
+    Args:
+        array: NumPy array to hash
+        stripe_size: Bytes per stripe
+
+    Returns:
+        Hexadecimal hash string
+    """
+    buffer = _byte_view(array)
+    nbytes = len(buffer)
+
+    sha256_hash = hashlib.sha256()
+    sha256_hash.update(f"{array.shape}|{array.dtype}|{nbytes}".encode())
+    if nbytes <= 3 * stripe_size:
+        sha256_hash.update(buffer)
+    else:
+        rng = np.random.default_rng(array.shape[0])
+        middle = int(rng.integers(stripe_size, nbytes - 2 * stripe_size))
+        sha256_hash.update(buffer[:stripe_size])
+        sha256_hash.update(buffer[middle : middle + stripe_size])
+        sha256_hash.update(buffer[-stripe_size:])
+    return sha256_hash.hexdigest()
 
 
 def compute_dataset_fingerprint(
-    data: np.ndarray, labels: np.ndarray, metadata: Optional[Dict[str, Any]] = None
+    data: np.ndarray,
+    labels: np.ndarray,
+    metadata: Optional[Dict[str, Any]] = None,
+    sample_data: bool = False,
+    tree_hash: bool = False,
 ) -> Dict[str, Any]:
     """
     Compute comprehensive fingerprint for a dataset.
@@ -66,18 +228,37 @@ def compute_dataset_fingerprint(
         data: Dataset features/samples
         labels: Dataset labels
         metadata: Optional metadata dictionary
+        sample_data: Hash sampled stripes of ``data`` instead of every byte
+        tree_hash: Hash every byte of ``data`` as a parallel tree hash
 
     Returns:
         Dictionary containing fingerprint components
+
+    Raises:
+        ValueError: If both sample_data and tree_hash are set
     """
+    if sample_data and tree_hash:
+        raise ValueError("sample_data and tree_hash are mutually exclusive")
+
+    if sample_data:
+        data_hash = compute_sampled_array_hash(data)
+    elif tree_hash:
+        data_hash = compute_array_hash_parallel(data)
+    else:
+        data_hash = compute_array_hash(data)
+
     fingerprint = {
-        "data_hash": compute_array_hash(data),
+        "data_hash": data_hash,
         "labels_hash": compute_array_hash(labels),
         "shape": str(data.shape),
         "dtype": str(data.dtype),
         "n_samples": int(data.shape[0]),
         "n_classes": int(len(np.unique(labels))),
     }
+    if sample_data:
+        fingerprint["data_hash_mode"] = "sampled"
+    elif tree_hash:
+        fingerprint["data_hash_mode"] = TREE_HASH_MODE
 
     if metadata:
         metadata_str = json.dumps(metadata, sort_keys=True)
@@ -91,32 +272,72 @@ def compute_dataset_fingerprint(
 
 
 def verify_fingerprint(
-    data: np.ndarray, labels: np.ndarray, expected_hash: str
+    data: np.ndarray,
+    labels: np.ndarray,
+    expected_hash: Union[str, Dict[str, Any]],
+    data_hash_mode: Optional[str] = None,
 ) -> bool:
     """
     Verify dataset against expected fingerprint.
 
+    Given a full fingerprint dict, shape, dtype and sample count are
+    compared first, so a mismatched dataset is rejected without hashing.
+
     Args:
         data: Dataset features
         labels: Dataset labels
-        expected_hash: Expected combined hash
+        expected_hash: Expected combined hash, or the full expected fingerprint
+        data_hash_mode: ``data_hash_mode`` of the expected fingerprint, if any
+            (read from the fingerprint itself when a dict is given)
 
     Returns:
         True if fingerprint matches
+
+    Raises:
+        ValueError: If data_hash_mode is not a known mode
     """
-    current = compute_dataset_fingerprint(data, labels)
+    if isinstance(expected_hash, dict):
+        expected = expected_hash
+        if (
+            expected.get("shape") != str(data.shape)
+            or expected.get("dtype") != str(data.dtype)
+            or expected.get("n_samples") != int(data.shape[0])
+        ):
+            return False
+        data_hash_mode = expected.get("data_hash_mode", data_hash_mode)
+        expected_hash = expected.get("combined_hash", "")
+
+    if data_hash_mode not in (None, "sampled", TREE_HASH_MODE):
+        raise ValueError(f"Unknown data hash mode: {data_hash_mode}")
+    current = compute_dataset_fingerprint(
+        data,
+        labels,
+        sample_data=data_hash_mode == "sampled",
+        tree_hash=data_hash_mode == TREE_HASH_MODE,
+    )
     return current["combined_hash"] == expected_hash
 
 
+def _json_line(entry: Dict[str, Any]) -> str:
+    """Serialize one log entry as a JSON Lines record."""
+    return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE).decode()
+
+
 class FingerprintLog:
-    """Maintains a log of dataset fingerprints for provenance tracking."""
+    """
+    Maintains a log of dataset fingerprints for provenance tracking.
+
+    The log file is JSON Lines, one entry per line, so adding an entry
+    appends a single line instead of rewriting the whole history. Logs in
+    the older single JSON array format are converted on load.
+    """
 
     def __init__(self, log_path: Path):
         """
         Initialize fingerprint log.
 
         Args:
-            log_path: Path to JSON log file
+            log_path: Path to JSON Lines log file
         """
         self.log_path = Path(log_path)
         self._log: List[Dict[str, Any]] = []
@@ -124,15 +345,28 @@ class FingerprintLog:
 
     def _load(self) -> None:
         """Load existing log from file."""
-        if self.log_path.exists():
-            with open(self.log_path, "r") as f:
-                self._log = json.load(f)
-
-    def _save(self) -> None:
-        """Save log to file."""
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, "r") as f:
+            text = f.read()
+        if text.lstrip().startswith("["):
+            # Legacy JSON array log; rewrite it once as JSON Lines
+            self._log = json.loads(text)
+            self._rewrite()
+        else:
+            self._log = [orjson.loads(line) for line in text.splitlines() if line]
+
+    def _rewrite(self) -> None:
+        """Write the whole log to file as JSON Lines."""
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.log_path, "w") as f:
-            json.dump(self._log, f, indent=2)
+            f.writelines(_json_line(entry) for entry in self._log)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Append one entry to the log file."""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a") as f:
+            f.write(_json_line(entry))
 
     def add_entry(
         self,
@@ -160,7 +394,7 @@ class FingerprintLog:
             "notes": notes,
         }
         self._log.append(entry)
-        self._save()
+        self._append(entry)
 
     def get_history(self, dataset_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
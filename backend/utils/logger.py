@@ -11,6 +11,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+_RESET = "\033[0m"
+
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with color support for console output."""
@@ -21,15 +23,28 @@ class ColoredFormatter(logging.Formatter):
         "WARNING": "\033[33m",  # Yellow
         "ERROR": "\033[31m",  # Red
         "CRITICAL": "\033[35m",  # Magenta
-        "RESET": "\033[0m",  # Reset
+        "RESET": _RESET,  # Reset
+    }
+
+    # Colored level names, built once rather than per record
+    COLORED_LEVELS = {
+        level: f"{color}{level}{_RESET}"
+        for level, color in COLORS.items()
+        if level != "RESET"
     }
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors."""
-        color = self.COLORS.get(record.levelname, self.COLORS["RESET"])
-        reset = self.COLORS["RESET"]
-        record.levelname = f"{color}{record.levelname}{reset}"
-        return super().format(record)
+        # The record is shared with later handlers (e.g. the log file), so
+        # the colored name is only swapped in for this format call
+        levelname = record.levelname
+        record.levelname = self.COLORED_LEVELS.get(
+            levelname, f"{_RESET}{levelname}{_RESET}"
+        )
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
 
 
 def setup_logger(
@@ -47,6 +62,13 @@ def setup_logger(
 
     Returns:
         Configured logger instance
+
+    Note:
+        None of these formats read process, thread or task fields. An
+        application that owns the whole process can skip collecting them by
+        setting ``logging.logProcesses``, ``logThreads``,
+        ``logMultiprocessing`` and ``logAsyncioTasks`` to False at its entry
+        point; this function leaves those process-wide switches alone.
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
@@ -4,38 +4,25 @@ PDF Export Utility.
 Generate PDF reports for poisoning analysis.
 """
 
-import json
+from bisect import bisect_right
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
 
-class PDFReportGenerator:
-    """Generate PDF reports (simplified HTML-based for portability)."""
-
-    def __init__(self, output_dir: Path = Path("reports")):
-        """Initialize report generator."""
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-    def generate_report(
-        self, analysis_results: Dict[str, Any], dataset_name: str = "unknown"
-    ) -> Path:
-        """Generate HTML report (PDF-compatible when printed)."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"poisoning_report_{dataset_name}_{timestamp}.html"
-        filepath = self.output_dir / filename
+# Appendix dump: NumPy values serialize natively; anything else via str
+_APPENDIX_JSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+)
 
-        html = self._build_html(analysis_results, dataset_name)
-
-        with open(filepath, "w") as f:
-            f.write(html)
-
-        return filepath
+# Score-box class per poisoning score band: [0, 25), [25, 50), [50, 75), 75+
+_SCORE_BOUNDS = (25.0, 50.0, 75.0)
+_SCORE_LEVELS = ("low", "medium", "high", "critical")
 
-    def _build_html(self, results: Dict[str, Any], name: str) -> str:
-        """Build HTML report content."""
-        html = f"""
+# Report skeleton, parsed once at import and filled by str.format; literal CSS
+# braces are doubled
+_REPORT_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -68,44 +55,85 @@ class PDFReportGenerator:
 <body>
     <div class="container">
         <h1>🛡️ Data Poisoning Detection Report</h1>
-        <p class="timestamp">Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+        <p class="timestamp">Generated: {generated}</p>
         <p><strong>Dataset:</strong> {name}</p>
 
         <h2>Executive Summary</h2>
-        {self._build_summary_section(results)}
+        {summary}
 
         <h2>Detection Results</h2>
-        {self._build_detection_section(results)}
+        {detection}
 
         <h2>Risk Assessment</h2>
-        {self._build_risk_section(results)}
+        {risk}
 
         <h2>Recommendations</h2>
-        {self._build_recommendations_section(results)}
+        {recommendations}
 
         <h2>Compliance Mapping</h2>
-        {self._build_compliance_section()}
+        {compliance}
 
         <h2>Appendix: Technical Details</h2>
         <pre style="background: #f8f9fa; padding: 15px; overflow-x: auto; font-size: 12px;">
-{json.dumps(results, indent=2, default=str)[:3000]}...
+{appendix}...
         </pre>
     </div>
 </body>
 </html>
 """
-        return html
+
+
+class PDFReportGenerator:
+    """Generate PDF reports (simplified HTML-based for portability)."""
+
+    def __init__(self, output_dir: Path = Path("reports")):
+        """Initialize report generator."""
+        # Created on first save, so constructing a generator touches no disk
+        self.output_dir = Path(output_dir)
+
+    def generate_report(
+        self, analysis_results: Dict[str, Any], dataset_name: str = "unknown"
+    ) -> Path:
+        """Generate HTML report (PDF-compatible when printed)."""
+        html = self.render_html(analysis_results, dataset_name)
+        return self.save_html(html, dataset_name)
+
+    def render_html(
+        self, analysis_results: Dict[str, Any], dataset_name: str = "unknown"
+    ) -> str:
+        """Render the HTML report in memory without touching disk."""
+        return self._build_html(analysis_results, dataset_name)
+
+    def save_html(self, html: str, dataset_name: str = "unknown") -> Path:
+        """Write pre-rendered report HTML to the output directory."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"poisoning_report_{dataset_name}_{timestamp}.html"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = self.output_dir / filename
+
+        with open(filepath, "w") as f:
+            f.write(html)
+
+        return filepath
+
+    def _build_html(self, results: Dict[str, Any], name: str) -> str:
+        """Build HTML report content."""
+        return _REPORT_TEMPLATE.format(
+            name=name,
+            generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            summary=self._build_summary_section(results),
+            detection=self._build_detection_section(results),
+            risk=self._build_risk_section(results),
+            recommendations=self._build_recommendations_section(results),
+            compliance=self._build_compliance_section(),
+            appendix=orjson.dumps(
+                results, default=str, option=_APPENDIX_JSON_OPTIONS
+            ).decode()[:3000],
+        )
 
     def _build_summary_section(self, results: Dict) -> str:
         score = results.get("poisoning_score", 0)
-        if score < 25:
-            level = "low"
-        elif score < 50:
-            level = "medium"
-        elif score < 75:
-            level = "high"
-        else:
-            level = "critical"
+        level = _SCORE_LEVELS[bisect_right(_SCORE_BOUNDS, score)]
 
         return f"""
         <div class="score-box {level}">
@@ -5,6 +5,7 @@ Generate charts, heatmaps, and clustering visualizations.
 """
 
 import base64
+from functools import lru_cache
 from io import BytesIO
 from typing import Dict, List, Optional
 
@@ -22,6 +23,17 @@ try:
 except ImportError:
     HAS_MATPLOTLIB = False
 
+# Largest heatmap side drawn cell-for-cell; bigger matrices are block-averaged
+_HEATMAP_MAX_SIZE = 1024
+
+
+@lru_cache(maxsize=64)
+def _colormap_lut(name: str, start: float, stop: float, n: int) -> np.ndarray:
+    """Sample n evenly spaced RGBA colors from a colormap once per n."""
+    colors = plt.get_cmap(name)(np.linspace(start, stop, n))
+    colors.flags.writeable = False  # Shared between charts
+    return colors
+
 
 def create_spectral_plot(
     singular_values: np.ndarray, title: str = "Singular Values"
@@ -52,14 +64,18 @@ def create_scatter_plot(
 
     fig, ax = plt.subplots(figsize=(10, 8))
 
-    unique_labels = np.unique(labels)
-    colors = plt.cm.tab10(np.linspace(0, 1, len(unique_labels)))  # type: ignore[attr-defined]
+    # Group points by class with one stable sort, so each class is a slice
+    # in its original order rather than a fresh boolean mask over all points
+    order = np.argsort(labels, kind="stable")
+    unique_labels, starts = np.unique(labels[order], return_index=True)
+    ends = np.r_[starts[1:], len(order)]
+    grouped = embeddings[order]
+    colors = _colormap_lut("tab10", 0.0, 1.0, len(unique_labels))
 
-    for i, label in enumerate(unique_labels):
-        mask = labels == label
+    for i, (label, start, end) in enumerate(zip(unique_labels, starts, ends)):
         ax.scatter(
-            embeddings[mask, 0],
-            embeddings[mask, 1],
+            grouped[start:end, 0],
+            grouped[start:end, 1],
             c=[colors[i]],
             label=f"Class {label}",
             alpha=0.6,
@@ -86,13 +102,33 @@ def create_scatter_plot(
     return _fig_to_base64(fig)
 
 
+def _downsample_heatmap(matrix: np.ndarray) -> np.ndarray:
+    """Block-average a matrix so neither side exceeds _HEATMAP_MAX_SIZE."""
+    rows, cols = matrix.shape
+    # The figure is ~1000 px wide at report DPI, so larger matrices are
+    # block-averaged first. Blocks round up and the ragged edge is padded
+    # with NaN, so every cell (including the last rows and columns) counts
+    br = -(-rows // _HEATMAP_MAX_SIZE)
+    bc = -(-cols // _HEATMAP_MAX_SIZE)
+    if br == 1 and bc == 1:
+        return matrix
+    out_rows, out_cols = -(-rows // br), -(-cols // bc)
+    padded = np.full((out_rows * br, out_cols * bc), np.nan)
+    padded[:rows, :cols] = matrix
+    return np.nanmean(padded.reshape(out_rows, br, out_cols, bc), axis=(1, 3))
+
+
 def create_heatmap(matrix: np.ndarray, title: str = "Heatmap") -> str:
     """Create heatmap visualization."""
     if not HAS_MATPLOTLIB:
         return ""
 
     fig, ax = plt.subplots(figsize=(10, 8))
-    im = ax.imshow(matrix, cmap="hot", aspect="auto")
+    rows, cols = matrix.shape
+    matrix = _downsample_heatmap(matrix)
+    im = ax.imshow(
+        matrix, cmap="hot", aspect="auto", extent=(-0.5, cols - 0.5, rows - 0.5, -0.5)
+    )
     plt.colorbar(im, ax=ax)
     ax.set_title(title)
 
@@ -135,7 +171,7 @@ def create_bar_chart(values: Dict[str, float], title: str = "Scores") -> str:
 
     names = list(values.keys())
     scores = list(values.values())
-    colors = plt.cm.viridis(np.linspace(0.2, 0.8, len(names)))  # type: ignore[attr-defined]
+    colors = _colormap_lut("viridis", 0.2, 0.8, len(names))
 
     bars = ax.bar(names, scores, color=colors)
     ax.set_ylabel("Score")
@@ -158,8 +194,16 @@ def create_bar_chart(values: Dict[str, float], title: str = "Scores") -> str:
 def _fig_to_base64(fig: "Figure") -> str:
     """Convert matplotlib figure to base64 string."""
     buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=100, bbox_inches="tight")
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode("utf-8")
+    # Fast deflate: PNG stays lossless, costing a few % in size for ~25% less
+    # encode time
+    fig.savefig(
+        buf,
+        format="png",
+        dpi=100,
+        bbox_inches="tight",
+        pil_kwargs={"compress_level": 1},
+    )
     plt.close(fig)
+    # Encode straight from the buffer's memory instead of a read() copy
+    img_str = base64.b64encode(buf.getbuffer()).decode("ascii")
     return f"data:image/png;base64,{img_str}"
@@ -61,6 +61,24 @@ def poisoned_tabular_dataset(generator: DatasetGenerator):
     )
 
 
+@pytest.fixture(scope="session")
+def small_tabular_dataset(generator: DatasetGenerator):
+    """Generate a small clean tabular dataset (100 samples)."""
+    return generator.generate_tabular_dataset(n_samples=100)
+
+
+@pytest.fixture(scope="session")
+def small_poisoned_tabular_dataset(generator: DatasetGenerator):
+    """Generate a small poisoned tabular dataset (100 samples, 10% poisoning)."""
+    return generator.generate_tabular_dataset(n_samples=100, poison_ratio=0.1)
+
+
+@pytest.fixture(scope="session")
+def small_poisoned_image_dataset(generator: DatasetGenerator):
+    """Generate a small poisoned image dataset (100 samples, 10% poisoning)."""
+    return generator.generate_image_dataset(n_samples=100, poison_ratio=0.1)
+
+
 @pytest.fixture(scope="session")
 def clean_text_dataset(generator: DatasetGenerator):
     """Generate a clean text dataset (no poisoning)."""
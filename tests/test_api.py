@@ -3,9 +3,13 @@
 Tests the FastAPI endpoints using httpx async client.
 """
 
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 
+from backend.api import report as report_api
+from backend.api.poison import compute_detection_accuracy
 from backend.main import app
 
 client = TestClient(app)
@@ -130,6 +134,7 @@ class TestDetectPoisonEndpoint:
                 "run_clustering": False,
                 "run_influence": False,
                 "run_trigger": False,
+                "force_run": True,
             },
         )
         assert response.status_code == 200
@@ -137,6 +142,33 @@ class TestDetectPoisonEndpoint:
         # With no poisoning, score should be low
         assert data["poisoning_score"] < 50
 
+    def test_detect_poison_clean_fast_path(self) -> None:
+        """Test poison_ratio=0 returns an empty result unless forced."""
+        payload = {"dataset_type": "tabular", "n_samples": 50, "poison_ratio": 0.0}
+        fast = client.post("/detect_poison", json=payload).json()
+        assert fast["suspected_indices"] == []
+        assert fast["detection_accuracy"]["f1"] == 1.0
+
+        forced = client.post("/detect_poison", json={**payload, "force_run": True})
+        assert forced.status_code == 200
+        assert forced.json()["ground_truth_poison_indices"] == []
+
+
+class TestDetectionAccuracy:
+    """Tests for detection accuracy metrics."""
+
+    def test_confusion_counts(self) -> None:
+        """Test precision/recall/FPR from overlapping index sets."""
+        metrics = compute_detection_accuracy([1, 2, 3], [2, 3, 4, 5], 10)
+        assert metrics["precision"] == pytest.approx(0.5)
+        assert metrics["recall"] == pytest.approx(2 / 3)
+        assert metrics["false_positive_rate"] == pytest.approx(2 / 7)
+
+    def test_no_ground_truth(self) -> None:
+        """Test perfect scores are reported when nothing is poisoned."""
+        metrics = compute_detection_accuracy([], [4], 10)
+        assert metrics["f1"] == 1.0
+
 
 class TestCleanEndpoint:
     """Tests for dataset cleaning endpoint."""
@@ -250,6 +282,38 @@ class TestReportEndpoint:
         # Should return HTML content
         assert "<!DOCTYPE html>" in response.text
         assert "Data Poisoning" in response.text
+        assert response.headers["content-type"].startswith("text/html")
+        assert "cache-control" not in response.headers
+
+    def test_report_persist_writes_file(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test persist=True creates the report directory and saves a copy."""
+        reports_dir = tmp_path / "reports"
+        monkeypatch.setattr(report_api._REPORT_GEN, "output_dir", reports_dir)
+        response = client.post(
+            "/report",
+            json={
+                "dataset_type": "tabular",
+                "n_samples": 50,
+                "n_classes": 3,
+                "dataset_name": "persisted_report",
+                "persist": True,
+            },
+        )
+        assert response.status_code == 200
+        saved = list(reports_dir.glob("poisoning_report_persisted_report_*"))
+        assert saved
+
+    def test_report_is_gzipped(self) -> None:
+        """Test large report responses are gzip-compressed."""
+        response = client.post(
+            "/report",
+            json={"dataset_type": "tabular", "n_samples": 50, "n_classes": 3},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
 
 
 class TestDashboard:
@@ -1,5 +1,7 @@
 """Tests for Data Poisoning Detection Tool."""
 
+import json
+
 import numpy as np
 import pytest
 
@@ -8,56 +10,179 @@ from backend.engines import (
     CleansingMode,
     CollapseRiskEngine,
     DatasetCleanser,
-    DatasetGenerator,
+    DatasetSummary,
+    DatasetType,
     DatasetValidator,
     SimplifiedInfluenceEstimator,
     SpectralSignaturesDetector,
+    SyntheticDataset,
+    TextTriggerDetector,
     UniversalTriggerDetector,
+    analyze_spectral,
+    compute_label_stats,
+    detect_triggers,
+    ensure_flat,
+    generate_dataset,
+    summarize_dataset,
+)
+from backend.engines.activation_clustering import SimpleFeatureExtractor
+from backend.utils import (
+    FingerprintLog,
+    compute_array_hash,
+    compute_array_hash_parallel,
+    compute_dataset_fingerprint,
+    verify_fingerprint,
 )
+from backend.utils.visuals import _downsample_heatmap
 
 
 class TestDatasetGenerator:
     """Tests for synthetic dataset generation."""
 
-    def test_generate_image_dataset(self):
+    def test_generate_image_dataset(self, generator):
         """Test image dataset generation."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_image_dataset(n_samples=100, n_classes=5)
+        dataset = generator.generate_image_dataset(n_samples=100, n_classes=5)
 
         assert dataset.data.shape[0] == 100
         assert len(dataset.labels) == 100
         assert len(np.unique(dataset.labels)) == 5
 
-    def test_generate_text_dataset(self):
+    def test_generate_text_dataset(self, generator):
         """Test text dataset generation."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_text_dataset(n_samples=100, n_classes=3)
+        dataset = generator.generate_text_dataset(n_samples=100, n_classes=3)
 
         assert dataset.data.shape[0] == 100
         assert len(dataset.labels) == 100
 
-    def test_generate_tabular_dataset(self):
+    def test_generate_tabular_dataset(self, generator):
         """Test tabular dataset generation."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=100, n_features=20)
+        dataset = generator.generate_tabular_dataset(n_samples=100, n_features=20)
 
         assert dataset.data.shape == (100, 20)
 
-    def test_poisoning_injection(self):
+    def test_generators_leave_global_rng_untouched(self, generator):
+        """Test every generator draws from a private, seeded RNG."""
+        np.random.seed(0)
+        expected = np.random.rand()
+        np.random.seed(0)
+        image = generator.generate_image_dataset(n_samples=20, poison_ratio=0.1)
+        text = generator.generate_text_dataset(n_samples=20, poison_ratio=0.1)
+        assert np.random.rand() == expected
+
+        image_again = generator.generate_image_dataset(n_samples=20, poison_ratio=0.1)
+        text_again = generator.generate_text_dataset(n_samples=20, poison_ratio=0.1)
+        np.testing.assert_array_equal(image_again.data, image.data)
+        np.testing.assert_array_equal(text_again.data, text.data)
+
+    def test_poisoning_injection(self, small_poisoned_image_dataset):
         """Test that poisoning creates expected samples."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_image_dataset(n_samples=100, poison_ratio=0.1)
+        dataset = small_poisoned_image_dataset
 
         assert len(dataset.metadata["poison_indices"]) == 10
 
 
+class TestDatasetCache:
+    """Tests for the cached dataset generator."""
+
+    def test_cache_returns_shared_readonly_dataset(self):
+        """Test repeated parameters reuse one read-only dataset."""
+        first = generate_dataset("tabular", 100, 3, 0.1, 42)
+        second = generate_dataset("tabular", 100, 3, 0.1, 42)
+
+        assert first is second
+        assert not first.data.flags.writeable
+        assert not first.labels.flags.writeable
+
+    def test_cache_rejects_unknown_type(self):
+        """Test unknown dataset types raise ValueError."""
+        with pytest.raises(ValueError):
+            generate_dataset("audio", 100, 3, 0.1, 42)
+
+    def test_spectral_result_reused_for_cached_dataset(self):
+        """Test read-only datasets share spectral results across calls."""
+        dataset = generate_dataset("tabular", 100, 3, 0.1, 42)
+
+        first = analyze_spectral(dataset.data, dataset.labels)
+        second = analyze_spectral(dataset.data, dataset.labels)
+        fresh = analyze_spectral(dataset.data.copy(), dataset.labels.copy())
+
+        assert first is second
+        assert fresh is not first
+        assert fresh.suspected_indices == first.suspected_indices
+
+    def test_trigger_result_reused_per_data_type(self):
+        """Test trigger results are cached per cached dataset and type."""
+        dataset = generate_dataset("image", 100, 3, 0.1, 42)
+
+        first = detect_triggers(dataset.data, dataset.labels, "image")
+        assert detect_triggers(dataset.data, dataset.labels, "image") is first
+        fresh = detect_triggers(dataset.data.copy(), dataset.labels, "image")
+        assert fresh is not first
+        assert fresh.poisoning_score == first.poisoning_score
+        np.testing.assert_array_equal(fresh.trigger_heatmap, first.trigger_heatmap)
+
+    def test_label_stats_shared_and_match_class_means(self):
+        """Test cached label statistics match per-class means."""
+        dataset = generate_dataset("image", 120, 4, 0.1, 42)
+
+        stats = compute_label_stats(dataset.data, dataset.labels)
+        assert stats is compute_label_stats(dataset.data, dataset.labels)
+
+        flat = dataset.data.reshape(len(dataset.data), -1)
+        for k, label in enumerate(stats.classes):
+            members = dataset.labels == label
+            assert stats.counts[k] == members.sum()
+            np.testing.assert_allclose(
+                stats.centroids[k], flat[members].mean(axis=0), atol=1e-5
+            )
+
+    def test_caches_ignore_read_only_views_of_writable_data(self):
+        """Test id-keyed caches recompute when a writable base is edited."""
+        base = np.random.default_rng(0).random((60, 4, 4, 1)).astype(np.float32)
+        labels = np.arange(60) % 3
+        labels.flags.writeable = False
+        view = base.view()
+        view.flags.writeable = False
+        transposed = view.transpose(0, 2, 1, 3)
+
+        fingerprint = compute_dataset_fingerprint(view, labels)
+        flat = ensure_flat(transposed)
+        spectral = analyze_spectral(view, labels)
+        base[:] = 0
+
+        assert not verify_fingerprint(view, labels, fingerprint)
+        assert not ensure_flat(transposed).any()
+        assert flat.any()
+        assert analyze_spectral(view, labels) is not spectral
+
+    def test_dataset_summary_variance_is_exact_for_large_offsets(self):
+        """Test feature variances stay accurate when means dwarf the spread."""
+        rng = np.random.default_rng(0)
+        data = (1e4 + rng.random((500, 8)) * 1e-2).astype(np.float32)
+        labels = np.arange(500) % 2
+
+        summary = DatasetSummary.from_data(data, labels)
+        np.testing.assert_allclose(
+            summary.feature_vars, data.astype(np.float64).var(axis=0), rtol=1e-9
+        )
+
+    def test_ensure_flat_shares_copies_of_read_only_views(self):
+        """Test a non-contiguous read-only view is flattened only once."""
+        dataset = generate_dataset("image", 60, 3, 0.0, 42)
+        transposed = dataset.data.transpose(0, 2, 1, 3)
+
+        flat = ensure_flat(transposed)
+        assert flat is ensure_flat(transposed)
+        np.testing.assert_array_equal(flat, transposed.reshape(len(transposed), -1))
+        assert np.shares_memory(ensure_flat(dataset.data), dataset.data)
+
+
 class TestDatasetValidator:
     """Tests for dataset validation."""
 
-    def test_valid_dataset(self):
+    def test_valid_dataset(self, small_tabular_dataset):
         """Test validation of clean dataset."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=100)
+        dataset = small_tabular_dataset
 
         validator = DatasetValidator()
         result = validator.validate(dataset)
@@ -65,25 +190,127 @@ class TestDatasetValidator:
         assert result.is_valid
         assert result.quality_score > 80
 
-    def test_fingerprint_generation(self):
+    def test_fingerprint_generation(self, generator):
         """Test fingerprint is generated."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=50)
+        dataset = generator.generate_tabular_dataset(n_samples=50)
 
         validator = DatasetValidator()
         result = validator.validate(dataset)
 
         assert result.fingerprint is not None
         assert "combined_hash" in result.fingerprint
+        assert "data_hash_mode" not in result.fingerprint
+
+    def test_fingerprint_skips_validation(self, small_tabular_dataset):
+        """Test the standalone fingerprint matches the validation one."""
+        validator = DatasetValidator()
+        fingerprint = validator.fingerprint(small_tabular_dataset)
+
+        assert fingerprint == validator.validate(small_tabular_dataset).fingerprint
+
+    def test_large_dataset_uses_sampled_hash(self):
+        """Test data above the full-hash limit gets a sampled data hash."""
+        dataset = generate_dataset("image", 100, 3, 0.1, 42)
+
+        validator = DatasetValidator(full_hash_limit=1024)
+        result = validator.validate(dataset)
+
+        assert result.fingerprint["data_hash_mode"] == "sampled"
+
+    def test_tree_hash_fingerprint_is_versioned_and_verifiable(self):
+        """Test tree hashes ignore the worker count and verify by mode."""
+        rng = np.random.default_rng(0)
+        data = rng.random((1100, 1000))  # Spans three hash slabs
+        labels = rng.integers(0, 3, 1100)
+
+        digest = compute_array_hash_parallel(data, max_workers=1)
+        assert compute_array_hash_parallel(data, max_workers=3) == digest
+        assert digest != compute_array_hash(data)
+
+        fingerprint = compute_dataset_fingerprint(data, labels, tree_hash=True)
+        assert fingerprint["data_hash_mode"] == "tree_sha256_v1"
+        expected = fingerprint["combined_hash"]
+        assert verify_fingerprint(data, labels, expected, "tree_sha256_v1")
+        assert not verify_fingerprint(data, labels, expected)
+        assert verify_fingerprint(data, labels, fingerprint)
+        assert not verify_fingerprint(data[:-1], labels[:-1], fingerprint)
+
+    def test_fingerprint_log_appends_lines_and_migrates_arrays(self, tmp_path):
+        """Test the log appends JSON lines and reads legacy JSON arrays."""
+        log_path = tmp_path / "fingerprints.json"
+        legacy = [{"dataset_name": "a", "fingerprint": {}, "operation": "scan"}]
+        log_path.write_text(json.dumps(legacy, indent=2))
+
+        log = FingerprintLog(log_path)
+        log.add_entry("b", {"combined_hash": "x"})
+        log.add_entry("a", {"combined_hash": "y"}, operation="clean")
+
+        assert len(log_path.read_text().splitlines()) == 3
+        reloaded = FingerprintLog(log_path)
+        assert [e["operation"] for e in reloaded.get_history("a")] == ["scan", "clean"]
+        assert len(reloaded.get_history()) == 3
+
+    def test_duplicate_sampling_leaves_global_rng_untouched(self):
+        """Test large-dataset duplicate sampling is seeded and private."""
+        dataset = generate_dataset("tabular", 1200, 3, 0.0, 42)
+        validator = DatasetValidator()
+
+        np.random.seed(0)
+        expected = np.random.rand()
+        np.random.seed(0)
+        first = validator._check_duplicates(dataset)
+        assert np.random.rand() == expected
+        assert validator._check_duplicates(dataset) == first
+
+    def test_statistics_std_is_exact_for_large_offsets(self):
+        """Test the reported data std survives a large common offset."""
+        rng = np.random.default_rng(0)
+        data = (1e4 + rng.random((200, 10)) * 1e-2).astype(np.float32)
+        dataset = SyntheticDataset(
+            data=data,
+            labels=np.arange(200) % 2,
+            dataset_type=DatasetType.TABULAR,
+            metadata={},
+        )
+
+        stats = DatasetValidator()._compute_statistics(dataset)
+        assert stats["data_std"] == pytest.approx(np.std(data, dtype=np.float64))
+
+    def test_near_duplicate_count_matches_allclose(self):
+        """Test vectorized duplicate counting agrees with pairwise allclose."""
+        rng = np.random.default_rng(0)
+        samples = rng.integers(0, 3, size=(120, 4)).astype(np.float32)
+
+        expected = sum(
+            np.allclose(samples[i], samples[j], rtol=1e-5)
+            for i in range(len(samples))
+            for j in range(i + 1, len(samples))
+        )
+        assert DatasetValidator._count_near_duplicates(samples) == expected
+
+    def test_near_duplicate_count_handles_non_finite_rows(self):
+        """Test rows holding inf or NaN are counted as pairwise allclose does."""
+        rng = np.random.default_rng(0)
+        samples = rng.integers(0, 3, size=(120, 4)).astype(np.float32)
+        samples[rng.random(samples.shape) < 0.2] = np.inf
+        samples[rng.random(samples.shape) < 0.1] = -np.inf
+        samples[rng.random(samples.shape) < 0.02] = np.nan
+
+        expected = sum(
+            np.allclose(samples[i], samples[j], rtol=1e-5)
+            for i in range(len(samples))
+            for j in range(i + 1, len(samples))
+        )
+        assert expected > 0
+        assert DatasetValidator._count_near_duplicates(samples) == expected
 
 
 class TestSpectralSignatures:
     """Tests for spectral analysis."""
 
-    def test_analyze_clean_data(self):
+    def test_analyze_clean_data(self, clean_tabular_dataset):
         """Test analysis on clean data."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=200, poison_ratio=0.0)
+        dataset = clean_tabular_dataset
 
         detector = SpectralSignaturesDetector()
         result = detector.analyze(dataset.data, dataset.labels)
@@ -91,11 +318,12 @@ class TestSpectralSignatures:
         assert result.poisoning_score < 50
         assert len(result.singular_values) > 0
 
-    def test_analyze_poisoned_data(self):
+    def test_analyze_poisoned_data(self, generator):
         """Test analysis on poisoned data."""
-        gen = DatasetGenerator()
         # Increase poison ratio and use specific seed for reproducibility
-        dataset = gen.generate_tabular_dataset(n_samples=200, poison_ratio=0.2, seed=42)
+        dataset = generator.generate_tabular_dataset(
+            n_samples=200, poison_ratio=0.2, seed=42
+        )
 
         # Lower threshold slightly for test robustness
         detector = SpectralSignaturesDetector(detection_threshold=1.5)
@@ -104,67 +332,118 @@ class TestSpectralSignatures:
         # Should detect some suspicious samples
         assert len(result.suspected_indices) > 0
 
+    def test_constant_class_scores_are_zero(self):
+        """Test a class of identical rows gets finite zero outlier scores."""
+        rng = np.random.default_rng(0)
+        data = rng.random((40, 6)).astype(np.float32)
+        data[:20] = data[0]
+        labels = np.repeat([0, 1], 20)
+
+        result = SpectralSignaturesDetector().analyze(data, labels)
+
+        assert np.isfinite(result.outlier_scores).all()
+        np.testing.assert_array_equal(result.outlier_scores[:20], 0.0)
+        assert result.outlier_scores[20:].std() > 0
+
 
 class TestActivationClustering:
     """Tests for activation clustering."""
 
-    def test_clustering_analysis(self):
+    def test_clustering_analysis(self, poisoned_tabular_dataset):
         """Test clustering on dataset."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=200, poison_ratio=0.1)
+        dataset = poisoned_tabular_dataset
 
         detector = ActivationClusteringDetector()
         result = detector.analyze(dataset.data, dataset.labels)
 
-        assert len(result.cluster_labels) == 200
+        assert result.cluster_labels.shape == (200,)
         assert result.embeddings_2d.shape[1] == 2
 
+    def test_feature_extractor_leaves_global_rng_untouched(self):
+        """Test projection uses a private RNG and is reproducible."""
+        data = np.ones((20, 8), dtype=np.float32)
+
+        np.random.seed(0)
+        expected = np.random.rand()
+        np.random.seed(0)
+        first = SimpleFeatureExtractor(hidden_dim=4, seed=7).fit(data, None)
+        assert np.random.rand() == expected
+
+        second = SimpleFeatureExtractor(hidden_dim=4, seed=7).fit(data, None)
+        np.testing.assert_array_equal(first.extract(data), second.extract(data))
+
 
 class TestInfluenceEstimator:
     """Tests for influence function estimation."""
 
-    def test_influence_estimation(self):
+    def test_influence_estimation(self, small_tabular_dataset):
         """Test influence score computation."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=100)
+        dataset = small_tabular_dataset
 
         estimator = SimplifiedInfluenceEstimator()
         result = estimator.estimate(dataset.data, dataset.labels)
 
-        assert len(result.influence_scores) == 100
+        assert result.influence_scores.shape == (100,)
 
 
 class TestTriggerDetector:
     """Tests for trigger detection."""
 
-    def test_image_trigger_detection(self):
+    def test_image_trigger_detection(self, small_poisoned_image_dataset):
         """Test image trigger detection."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_image_dataset(n_samples=100, poison_ratio=0.1)
+        dataset = small_poisoned_image_dataset
 
         detector = UniversalTriggerDetector()
         result = detector.detect(dataset.data, dataset.labels, "image")
 
-        assert result.trigger_heatmap is not None
+        # One heat value per pixel location
+        assert isinstance(result.trigger_heatmap, np.ndarray)
+        assert result.trigger_heatmap.shape == dataset.data.shape[1:3]
+
+    def test_image_trigger_detection_on_small_images(self):
+        """Test images smaller than a corner patch are scanned without error."""
+        rng = np.random.default_rng(0)
+        detector = UniversalTriggerDetector()
+        for shape in [(20, 4, 8, 1), (20, 8, 4, 3), (20, 3, 3, 1)]:
+            images = rng.random(shape, dtype=np.float32)
+            labels = np.arange(20) % 2
+            result = detector.detect(images, labels, "image")
+            assert result.trigger_heatmap.shape == shape[1:3]
 
-    def test_text_trigger_detection(self):
+    def test_text_trigger_detection(self, generator):
         """Test text trigger detection."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_text_dataset(n_samples=100, poison_ratio=0.1)
+        dataset = generator.generate_text_dataset(n_samples=100, poison_ratio=0.1)
 
         detector = UniversalTriggerDetector()
         result = detector.detect(dataset.data, dataset.labels, "text")
 
         assert isinstance(result.detected_triggers, list)
 
+    def test_text_sequence_triggers_need_identical_windows(self):
+        """Test fractional or NaN token windows are not merged into one pattern."""
+        rng = np.random.default_rng(0)
+        texts = rng.random((200, 20), dtype=np.float32)
+        texts[0, -5:] = np.nan
+        labels = np.zeros(200, dtype=int)
+        classes, class_ids = np.unique(labels, return_inverse=True)
+
+        detector = TextTriggerDetector()
+        assert detector._check_repeated_patterns(texts, class_ids, classes) == []
+
+        # Exact integer windows are still grouped
+        texts[1:, -5:] = np.array([901, 902, 903, 904, 905], dtype=np.float32)
+        triggers = detector._check_repeated_patterns(texts, class_ids, classes)
+        assert len(triggers) == 1
+        assert triggers[0]["pattern"] == [901.0, 902.0, 903.0, 904.0, 905.0]
+        assert triggers[0]["frequency"] == 199
+
 
 class TestRiskEngine:
     """Tests for collapse risk assessment."""
 
-    def test_risk_assessment(self):
+    def test_risk_assessment(self, small_tabular_dataset):
         """Test risk score computation."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=100)
+        dataset = small_tabular_dataset
 
         engine = CollapseRiskEngine()
         result = engine.assess(dataset.data, dataset.labels)
@@ -173,14 +452,44 @@ class TestRiskEngine:
         assert result.risk_level is not None
         assert len(result.recommendations) > 0
 
+    def test_risk_reuses_spectral_feature_moments(self, generator):
+        """Test spectral feature variances give the same collapse risk."""
+        dataset = generator.generate_image_dataset(n_samples=100)
+
+        spectral = SpectralSignaturesDetector().analyze(dataset.data, dataset.labels)
+        flat = dataset.data.reshape(len(dataset.data), -1)
+        np.testing.assert_allclose(spectral.feature_vars, flat.var(axis=0), atol=1e-6)
+
+        engine = CollapseRiskEngine()
+        plain = engine.assess(dataset.data, dataset.labels)
+        reused = engine.assess(dataset.data, dataset.labels, spectral_result=spectral)
+        assert reused.risk_factors == pytest.approx(plain.risk_factors)
+
+    def test_dataset_summary_shared_by_spectral_and_risk(self):
+        """Test one cached summary feeds both engines unchanged results."""
+        dataset = generate_dataset("image", 120, 4, 0.1, 42)
+
+        summary = summarize_dataset(dataset.data, dataset.labels)
+        assert summary is summarize_dataset(dataset.data, dataset.labels)
+        assert (np.diff(dataset.labels[summary.order]) >= 0).all()
+
+        detector = SpectralSignaturesDetector()
+        plain = detector.analyze(dataset.data, dataset.labels)
+        shared = detector.analyze(dataset.data, dataset.labels, summary)
+        np.testing.assert_array_equal(shared.outlier_scores, plain.outlier_scores)
+
+        engine = CollapseRiskEngine()
+        risk = engine.assess(dataset.data, dataset.labels, summary=summary)
+        expected = engine.assess(dataset.data, dataset.labels, spectral_result=plain)
+        assert risk.risk_factors == pytest.approx(expected.risk_factors)
+
 
 class TestCleanser:
     """Tests for dataset cleaning."""
 
-    def test_strict_cleaning(self):
+    def test_strict_cleaning(self, small_poisoned_tabular_dataset):
         """Test strict cleaning mode."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=100, poison_ratio=0.1)
+        dataset = small_poisoned_tabular_dataset
 
         suspected = dataset.metadata["poison_indices"]
 
@@ -189,10 +498,9 @@ class TestCleanser:
 
         assert result.summary["removed_samples"] == len(suspected)
 
-    def test_safe_cleaning(self):
+    def test_safe_cleaning(self, small_poisoned_tabular_dataset):
         """Test safe cleaning mode."""
-        gen = DatasetGenerator()
-        dataset = gen.generate_tabular_dataset(n_samples=100, poison_ratio=0.1)
+        dataset = small_poisoned_tabular_dataset
 
         suspected = dataset.metadata["poison_indices"]
 
@@ -203,5 +511,27 @@ class TestCleanser:
         assert result.summary["removed_samples"] <= len(suspected)
 
 
+class TestHeatmap:
+    """Tests for heatmap downsampling."""
+
+    def test_downsample_caps_size_and_keeps_edges(self):
+        """Test oversized heatmaps fit the cap without dropping edge cells."""
+        matrix = np.zeros((2047, 1030))
+        matrix[-1, -1] = 1.0
+
+        small = _downsample_heatmap(matrix)
+
+        assert max(small.shape) <= 1024
+        assert small.shape == (1024, 515)
+        # The last block averages only the real cells it covers
+        assert small[-1, -1] == pytest.approx(0.5)
+        assert small.sum() == pytest.approx(0.5)
+
+    def test_downsample_leaves_small_matrices_alone(self):
+        """Test heatmaps within the cap are drawn cell-for-cell."""
+        matrix = np.arange(12.0).reshape(3, 4)
+        assert _downsample_heatmap(matrix) is matrix
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])